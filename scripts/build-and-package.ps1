@@ -62,6 +62,15 @@ if ($LASTEXITCODE -ne 0) {
     Write-Host "Warning: zstandard verification failed, but continuing..." -ForegroundColor Yellow
 }
 
+# Bundle ARB translations into a single file loaded at startup
+Write-Host "`nBundling locale files..." -ForegroundColor Cyan
+& conda run -n flet-env python scripts/bundle_locales.py
+
+if ($LASTEXITCODE -ne 0) {
+    Write-Host "Failed to bundle locale files with exit code $LASTEXITCODE" -ForegroundColor Red
+    exit 1
+}
+
 # Step 2: Build with Flet
 Write-Host "`nStep 2: Building with flet..." -ForegroundColor Yellow
 Write-Host "main.py exists: $(Test-Path (Join-Path $workspaceRoot 'main.py'))" -ForegroundColor Cyan
@@ -0,0 +1,37 @@
+"""
+Bundle all ARB translation files into a single compact JSON file.
+
+Run at build time (see build-and-package.ps1). The app loads the bundle in one
+read/parse instead of opening each ARB file, and falls back to the ARB files
+whenever the bundle is missing or older than any of them.
+"""
+import json
+import sys
+from pathlib import Path
+
+I18N_DIR = Path(__file__).parent.parent / 'assets' / 'i18n'
+BUNDLE_NAME = 'locales.bundle.json'
+
+
+def bundle_locales(i18n_dir: Path = I18N_DIR) -> Path:
+    """Write {locale: {key: text}} for every ARB file, metadata stripped"""
+    bundle = {}
+    for arb_file in sorted(i18n_dir.glob('*.arb')):
+        data = json.loads(arb_file.read_bytes())
+        # Filter out metadata (keys starting with @@) and placeholder descriptors
+        bundle[arb_file.stem] = {
+            k: v for k, v in data.items()
+            if not k.startswith('@@') and isinstance(v, str)
+        }
+    
+    bundle_path = i18n_dir / BUNDLE_NAME
+    bundle_path.write_text(
+        json.dumps(bundle, ensure_ascii=False, separators=(',', ':')),
+        encoding='utf-8',
+    )
+    print(f"bundle_locales: wrote {len(bundle)} locale(s) to {bundle_path}")
+    return bundle_path
+
+
+if __name__ == '__main__':
+    bundle_locales(Path(sys.argv[1]) if len(sys.argv) > 1 else I18N_DIR)
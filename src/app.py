@@ -3,98 +3,89 @@ L4D2 VPK Manager - Main Application
 Uses MVVM architecture
 """
 
-import flet as ft
-from pathlib import Path
+import logging
 
+import flet as ft
 
-def _safe_print(msg: str):
-    """Safe print that handles encoding errors"""
-    try:
-        print(msg)
-    except UnicodeEncodeError:
-        # If encoding fails, replace problematic characters
-        print(msg.encode('utf-8', errors='replace').decode('utf-8', errors='replace'))
+logger = logging.getLogger(__name__)
 
 
 def main(page: "ft.Page"):
     """Main application entry point"""
     
-    _safe_print("=" * 50)
-    _safe_print("main() function called")
-    _safe_print(f"Page object: {page}")
-    _safe_print("=" * 50)
+    logger.debug("main: called, page=%s", page)
     
     try:
         # Initialize localization first
-        _safe_print("Importing localization...")
         from core.localization import localization
-        _safe_print("✓ Localization imported")
+        logger.debug("main: localization imported")
         
-        _safe_print(f"Available locales: {localization.get_available_locales()}")
         localization.set_locale('zh')  # Default to Chinese, can be changed
-        _safe_print(f"Current locale: {localization.get_locale()}")
-        
-        # Test translations
-        _safe_print(f"Test translation - appTitle: {localization.t('appTitle')}")
-        _safe_print(f"Test translation - directoryPathLabel: {localization.t('directoryPathLabel')}")
         
+        # The arguments are evaluated even when the records are dropped
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("main: available locales=%s, current locale=%s", localization.get_available_locales(), localization.get_locale())
+            
+            # Test translations
+            logger.debug("main: test translation - appTitle=%s, directoryPathLabel=%s", localization.t('appTitle'), localization.t('directoryPathLabel'))
+    
     except Exception as e:
-        _safe_print(f"✗ Error initializing localization: {e}")
-        import traceback
-        _safe_print(traceback.format_exc())
+        logger.exception("main: error initializing localization")
         # Show error on page
         page.add(ft.Text(f"Error loading localization: {e}", color="red"))
         return
     
     try:
         # Configure page
-        _safe_print("Configuring page...")
         page.title = localization.t('appTitle')
         page.window.width = 900
         page.window.height = 600
         page.window.min_width = 600
         page.window.min_height = 400
-        _safe_print("✓ Page configured")
+        logger.debug("main: page configured")
     except Exception as e:
-        _safe_print(f"Warning: Could not set window properties: {e}")
+        logger.warning("main: could not set window properties: %s", e)
+    
+    # Paint a lightweight placeholder first; the VPK Manager UI (imports,
+    # ViewModel init, directory scan) is built off the first-paint path
+    page.add(ft.Container(
+        content=ft.ProgressRing(),
+        alignment=ft.alignment.center,
+        expand=True,
+    ))
+    page.update()
+    logger.debug("main: placeholder painted")
     
+    page.run_thread(_build_vpk_manager, page)
+
+
+def _build_vpk_manager(page: "ft.Page"):
+    """Build the VPK Manager UI and swap it in for the startup placeholder"""
     try:
         # Initialize viewmodel and screen
-        _safe_print("Importing VPK Manager components...")
         from features.vpk_manager.screens.vpk_manager_screen import VpkManagerScreen
         from features.vpk_manager.viewmodels.vpk_manager_viewmodel import VpkManagerViewModel
-        _safe_print("✓ Components imported")
+        logger.debug("_build_vpk_manager: components imported")
         
-        _safe_print("Creating ViewModel...")
         viewmodel = VpkManagerViewModel()
-        _safe_print("✓ ViewModel created")
+        logger.debug("_build_vpk_manager: ViewModel created")
         
-        _safe_print("Creating Screen...")
         vpk_manager_screen = VpkManagerScreen(viewmodel)
         vpk_manager_screen.set_page(page)
-        _safe_print("✓ Screen created and page set")
+        logger.debug("_build_vpk_manager: screen created and page set")
         
-        # Build UI and add to page
-        _safe_print("Building UI...")
+        # Build UI and replace the placeholder
         ui = vpk_manager_screen.build()
-        _safe_print(f"✓ UI built: {type(ui)}")
+        logger.debug("_build_vpk_manager: UI built: %s", type(ui))
         
-        _safe_print("Adding UI to page...")
+        page.controls.clear()
         page.add(ui)
-        _safe_print("✓ UI added to page")
-        
-        _safe_print("=" * 50)
-        _safe_print("Application UI loaded successfully!")
-        _safe_print("=" * 50)
-        
+        logger.debug("_build_vpk_manager: application UI loaded")
+    
     except Exception as e:
-        _safe_print(f"✗ Error building UI: {e}")
-        import traceback
-        _safe_print(traceback.format_exc())
+        logger.exception("_build_vpk_manager: error building UI")
         # Show error on page
         error_text = f"Error building UI: {str(e)}"
+        page.controls.clear()
         page.add(ft.Text(error_text, color="red", size=14))
         page.update()
-
-    page.add(ui)
-    _safe_print("UI added to page")
\ No newline at end of file
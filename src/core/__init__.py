@@ -1,3 +1,3 @@
 """Core utilities and services"""
 
-__all__ = ['services', 'viewmodels', 'widgets', 'utils']
+__all__ = ['diagnostics', 'services', 'viewmodels', 'widgets', 'utils']
@@ -0,0 +1,71 @@
+"""Startup diagnostics: stdio encoding and opt-in debug logging (VPK_DEBUG)"""
+
+import atexit
+import logging
+import sys
+import traceback
+from pathlib import Path
+from typing import Optional, TextIO
+
+# Log file sits next to main.py
+LOG_FILE = Path(__file__).parent.parent.parent / "app_debug.log"
+
+_log_handle: Optional[TextIO] = None
+
+
+def configure_stdio():
+    """Set UTF-8 encoding for stdout and stderr to handle special characters"""
+    # Reconfigure the existing streams in place rather than stacking a new wrapper
+    for stream in (sys.stdout, sys.stderr):
+        if stream is None or (stream.encoding or '').lower().replace('-', '') == 'utf8':
+            continue
+        try:
+            stream.reconfigure(encoding='utf-8', errors='replace')
+        except (AttributeError, ValueError):
+            pass
+
+
+def debug_log(msg: str):
+    """Write debug message to both console and log file (no-op until enable_debug())"""
+    if _log_handle is None:
+        return
+    try:
+        print(msg)
+        _log_handle.write(msg + "\n")
+        _log_handle.flush()
+    except Exception as e:
+        try:
+            _log_handle.write(f"Logging error: {e}\n")
+            _log_handle.flush()
+        except Exception:
+            pass
+
+
+def enable_debug():
+    """Open app_debug.log, record the startup environment and log uncaught exceptions"""
+    global _log_handle
+    if _log_handle is not None:
+        return
+    
+    _log_handle = open(LOG_FILE, "w", encoding="utf-8")
+    atexit.register(_log_handle.close)
+    
+    # Debug-level records from module loggers go to the console and the log file
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(name)s: %(message)s',
+        handlers=[logging.StreamHandler(), logging.StreamHandler(_log_handle)],
+    )
+    
+    previous_hook = sys.excepthook
+    
+    def log_exception(exc_type, exc_value, exc_tb):
+        debug_log(f"✗ Unhandled error: {exc_value}")
+        debug_log(''.join(traceback.format_exception(exc_type, exc_value, exc_tb)))
+        previous_hook(exc_type, exc_value, exc_tb)
+    
+    sys.excepthook = log_exception
+    
+    debug_log(f"Application started from: {sys.argv[0]}")
+    debug_log(f"Working directory: {Path.cwd()}")
+    debug_log(f"Python path: {sys.path}")
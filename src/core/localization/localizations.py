@@ -1,74 +1,156 @@
 """Localization manager for handling multi-language support using ARB files"""
 
 import json
+import logging
+import os
+import sys
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-class Localizations:
-    """Singleton class for managing localization with ARB files"""
+logger = logging.getLogger(__name__)
+
+
+def _discover_i18n_dir() -> Optional[Path]:
+    """Locate the i18n directory (probed once at import)"""
+    # Try multiple possible paths for the i18n directory
+    possible_paths = [
+        Path(__file__).parent.parent.parent.parent / 'assets' / 'i18n',  # From __file__
+        Path.cwd() / 'assets' / 'i18n',  # Current working directory
+        Path(__file__).parent.parent.parent.parent.parent / 'assets' / 'i18n',  # One level up
+    ]
     
-    _instance: Optional['Localizations'] = None
+    i18n_dir = next((path for path in possible_paths if path.exists()), None)
+    if i18n_dir is None:
+        logger.warning("i18n directory not found. Tried: %s", [str(p) for p in possible_paths])
+    else:
+        logger.debug("Found i18n directory at: %s", i18n_dir)
+    return i18n_dir
+
+
+_I18N_DIR = _discover_i18n_dir()
+
+# Pre-built {locale: translations} file produced by scripts/bundle_locales.py
+_BUNDLE_NAME = 'locales.bundle.json'
+
+# Most interpolated results memoized before the memo is reset
+_FORMAT_CACHE_SIZE = 512
+
+
+def _freeze(translations: Dict[str, str]) -> Mapping[str, str]:
+    """Return a read-only view of a locale's translations with interned keys"""
+    return MappingProxyType({sys.intern(k): v for k, v in translations.items()})
+
+
+class _SafeDict(dict):
+    """Mapping for str.format_map that leaves unknown placeholders untouched"""
     
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    def __missing__(self, key: str) -> str:
+        return '{' + key + '}'
+
+
+class Localizations:
+    """Manages localization with ARB files (shared instance lives in core.localization)"""
     
     def __init__(self):
         """Initialize the localization system"""
-        if hasattr(self, '_initialized'):
+        self._current_locale = 'en'
+        # Locale name -> ARB file path, discovered without opening the files
+        self._locale_paths: Dict[str, Path] = {}
+        # Build-time bundle of all locales, used only when newer than every ARB file
+        self._bundle_path: Optional[Path] = None
+        # Locale name -> translations, populated lazily on first access
+        self._translations: Dict[str, Mapping[str, str]] = {}
+        # (locale, key) -> resolved text for parameterless lookups
+        self._cache: Dict[Tuple[str, str], str] = {}
+        # (locale, key, default, params) -> interpolated text for lookups with parameters
+        self._format_cache: Dict[tuple, str] = {}
+        self._discover_locales()
+    
+    def _discover_locales(self):
+        """Discover available ARB translation files without parsing them"""
+        if _I18N_DIR is None:
             return
         
-        self._initialized = True
-        self._current_locale = 'en'
-        self._translations: Dict[str, Dict[str, str]] = {}
-        self._load_translations()
+        bundle_entry = None
+        newest_arb_mtime = 0.0
+        with os.scandir(_I18N_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith('.arb') and entry.is_file():
+                    self._locale_paths[entry.name[:-4]] = Path(entry.path)
+                    newest_arb_mtime = max(newest_arb_mtime, entry.stat().st_mtime)
+                elif entry.name == _BUNDLE_NAME:
+                    bundle_entry = entry
+        
+        # Ignore a stale bundle so edits to ARB files take effect during development
+        if bundle_entry is not None and bundle_entry.stat().st_mtime >= newest_arb_mtime:
+            self._bundle_path = Path(bundle_entry.path)
+    
+    def _load_bundle(self) -> bool:
+        """Load every locale from the pre-built bundle in a single parse"""
+        bundle_path = self._bundle_path
+        self._bundle_path = None  # One attempt only; fall back to ARB files on failure
+        try:
+            raw = bundle_path.read_bytes()
+            data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+        except Exception as e:
+            logger.error("Error loading %s: %s", bundle_path, e)
+            return False
+        
+        for locale, translations in data.items():
+            if locale in self._locale_paths and locale not in self._translations:
+                self._translations[locale] = _freeze(translations)
+        logger.debug("Loaded locale bundle: %s (%s locales)", bundle_path, len(data))
+        return True
     
-    def _load_translations(self):
-        """Load all ARB translation files"""
-        # Try multiple possible paths for the i18n directory
-        possible_paths = [
-            Path(__file__).parent.parent.parent.parent / 'assets' / 'i18n',  # From __file__
-            Path.cwd() / 'assets' / 'i18n',  # Current working directory
-            Path(__file__).parent.parent.parent.parent.parent / 'assets' / 'i18n',  # One level up
-        ]
+    def _ensure_loaded(self, locale: str) -> Mapping[str, str]:
+        """Load the ARB file for a locale on first access"""
+        translations = self._translations.get(locale)
+        if translations is not None:
+            return translations
         
-        i18n_dir = None
-        for path in possible_paths:
-            if path.exists():
-                i18n_dir = path
-                print(f"Found i18n directory at: {i18n_dir}")
-                break
+        arb_file = self._locale_paths.get(locale)
+        if arb_file is None:
+            return {}
         
-        if i18n_dir is None:
-            print(f"Warning: i18n directory not found. Tried: {[str(p) for p in possible_paths]}")
-            return
+        if self._bundle_path is not None and self._load_bundle():
+            translations = self._translations.get(locale)
+            if translations is not None:
+                return translations
+        
+        translations = {}
+        try:
+            raw = arb_file.read_bytes()
+            data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+            
+            # Filter out metadata (keys starting with @@)
+            translations = {
+                k: v for k, v in data.items()
+                if not k.startswith('@@') and isinstance(v, str)
+            }
+            logger.debug("Loaded locale: %s (%s translations)", locale, len(translations))
+        except Exception as e:
+            logger.error("Error loading %s: %s", arb_file, e)
         
-        # Load all .arb files
-        for arb_file in i18n_dir.glob('*.arb'):
-            locale = arb_file.stem
-            try:
-                with open(arb_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Filter out metadata (keys starting with @@)
-                translations = {
-                    k: v for k, v in data.items()
-                    if not k.startswith('@@') and isinstance(v, str)
-                }
-                
-                self._translations[locale] = translations
-                print(f"Loaded locale: {locale} ({len(translations)} translations)")
-            except Exception as e:
-                print(f"Error loading {arb_file}: {e}")
+        translations = _freeze(translations)
+        self._translations[locale] = translations
+        return translations
     
     def set_locale(self, locale: str):
         """Set the current locale"""
-        if locale in self._translations:
+        if locale in self._locale_paths:
             self._current_locale = locale
+            self._cache.clear()
+            self._format_cache.clear()
+            self._ensure_loaded(locale)
         else:
-            print(f"Warning: Locale '{locale}' not found. Available: {list(self._translations.keys())}")
+            logger.warning("Locale %r not found. Available: %s", locale, list(self._locale_paths))
     
     def get_locale(self) -> str:
         """Get the current locale"""
@@ -76,41 +158,94 @@ class Localizations:
     
     def get_available_locales(self) -> list:
         """Get list of available locales"""
-        return list(self._translations.keys())
+        return list(self._locale_paths)
     
-    def translate(self, key: str, params: Optional[Dict[str, str]] = None) -> str:
+    def translate(self, key: str, params: Optional[Dict[str, str]] = None,
+                  default: Optional[str] = None) -> str:
         """
         Translate a key to the current locale
         
         Args:
             key: Translation key
             params: Optional parameters for string interpolation
+            default: Optional text to use when the key has no translation
             
         Returns:
-            Translated string, or the key itself if not found
+            Translated string, or default (else the key itself) if not found
         """
-        translations = self._translations.get(self._current_locale, {})
-        text = translations.get(key, key)
+        if not params:
+            cache_key = (self._current_locale, key)
+            text = self._cache.get(cache_key)
+            if text is None:
+                key = sys.intern(key)
+                translations = self._translations.get(self._current_locale)
+                if translations is None:
+                    translations = self._ensure_loaded(self._current_locale)
+                text = translations.get(key, key)
+                self._cache[cache_key] = text
+            # Misses are cached as the key itself
+            if default is not None and text == key:
+                return default
+            return text
         
-        # Handle parameter interpolation
-        if params:
-            for param_key, param_value in params.items():
-                text = text.replace(f'{{{param_key}}}', str(param_value))
+        try:
+            cache_key = (self._current_locale, key, default, frozenset(params.items()))
+            text = self._format_cache.get(cache_key)
+        except TypeError:
+            # Unhashable parameter value; interpolate without memoizing
+            cache_key = text = None
+        if text is not None:
+            return text
         
+        text = self._interpolate(key, params, default)
+        if cache_key is not None:
+            if len(self._format_cache) >= _FORMAT_CACHE_SIZE:
+                self._format_cache.clear()
+            self._format_cache[cache_key] = text
         return text
     
-    def t(self, key: str, **kwargs) -> str:
+    def _interpolate(self, key: str, params: Dict[str, str], default: Optional[str]) -> str:
+        """Look up a key and substitute its {placeholders} from params"""
+        translations = self._translations.get(self._current_locale)
+        if translations is None:
+            translations = self._ensure_loaded(self._current_locale)
+        text = translations.get(key)
+        if text is None:
+            text = key if default is None else default
+        
+        if '{' not in text:
+            return text
+        
+        # Handle parameter interpolation in a single pass
+        try:
+            return text.format_map(_SafeDict(params))
+        except (ValueError, IndexError, AttributeError):
+            # Template is not format-compatible (e.g. stray braces); substitute literally
+            for param_key, param_value in params.items():
+                text = text.replace(f'{{{param_key}}}', str(param_value))
+            return text
+    
+    def t(self, key: str, default: Optional[str] = None, **kwargs) -> str:
         """Shorthand for translate method"""
-        return self.translate(key, kwargs if kwargs else None)
+        if not kwargs:
+            # Memoized parameterless lookups are answered here without the translate() call
+            text = self._cache.get((self._current_locale, key))
+            if text is not None and (default is None or text != key):
+                return text
+        return self.translate(key, kwargs if kwargs else None, default)
     
-    def get_translation_dict(self, locale: Optional[str] = None) -> Dict[str, str]:
-        """Get entire translation dictionary for a locale"""
+    def get_translation_dict(self, locale: Optional[str] = None) -> Mapping[str, str]:
+        """Get entire translation dictionary for a locale (read-only)"""
         if locale is None:
             locale = self._current_locale
         
-        return self._translations.get(locale, {})
+        return self._ensure_loaded(locale)
     
     def reload_translations(self):
         """Reload all translation files"""
         self._translations.clear()
-        self._load_translations()
+        self._cache.clear()
+        self._format_cache.clear()
+        self._locale_paths.clear()
+        self._bundle_path = None
+        self._discover_locales()
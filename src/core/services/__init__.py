@@ -1,5 +1,8 @@
 """Core services"""
 
-from src.core.services.storage_service import StorageService
+from .storage_service import StorageService
 
-__all__ = ['StorageService']
+# Global instance
+storage = StorageService()
+
+__all__ = ['StorageService', 'storage']
@@ -1,25 +1,28 @@
 """Storage service for persisting user preferences and data"""
 
+import atexit
 import json
+import logging
+import os
+import threading
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
 
 class StorageService:
-    """Singleton service for persisting user preferences to local storage"""
+    """Service for persisting user preferences to local storage (shared instance lives in core.services)"""
     
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
+    FLUSH_DELAY = 0.1  # Seconds to wait for further changes before writing to disk
     
     def __init__(self):
-        if self._initialized:
-            return
-        
         # Create storage directory in user's home
         self._storage_dir = Path.home() / '.l4d2_vpk_manager'
         self._storage_dir.mkdir(exist_ok=True)
@@ -30,7 +33,11 @@ class StorageService:
         # Load existing preferences
         self._preferences = self._load_preferences()
         
-        self._initialized = True
+        # Debounced write state - bursts of set()/remove() produce a single write
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
     
     def _load_preferences(self) -> dict:
         """Load preferences from storage file"""
@@ -38,25 +45,61 @@ class StorageService:
             return {}
         
         try:
-            with open(self._storage_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            raw = self._storage_file.read_bytes()
+            return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
         except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading preferences: {e}")
+            logger.error("Error loading preferences: %s", e)
             return {}
     
     def _save_preferences(self):
-        """Save preferences to storage file"""
+        """Save preferences to storage file (atomically via temp file + rename)"""
+        tmp_file = self._storage_file.with_suffix('.json.tmp')
         try:
-            with open(self._storage_file, 'w', encoding='utf-8') as f:
-                json.dump(self._preferences, f, ensure_ascii=False, indent=2)
-        except IOError as e:
-            print(f"Error saving preferences: {e}")
+            if HAS_ORJSON:
+                data = orjson.dumps(
+                    self._preferences,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                )
+            else:
+                data = json.dumps(self._preferences, ensure_ascii=False, indent=2).encode('utf-8')
+            # A crash mid-write only ever leaves the temp file behind; the
+            # previous preferences.json stays intact until os.replace()
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, self._storage_file)
+        except (OSError, TypeError, ValueError) as e:
+            # TypeError/ValueError: value not JSON-serializable (orjson.JSONEncodeError is a TypeError)
+            logger.error("Error saving preferences: %s", e)
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+    
+    def _schedule_flush(self):
+        """Mark preferences dirty and restart the debounce timer (caller holds the lock)"""
+        self._dirty = True
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def flush(self):
+        """Write pending preference changes to disk immediately"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._save_preferences()
     
     def set(self, key: str, value: Any):
         """Set a preference value"""
-        self._preferences[key] = value
-        self._save_preferences()
-        print(f"StorageService.set: key='{key}', value='{value}'")
+        with self._lock:
+            self._preferences[key] = value
+            self._schedule_flush()
+        logger.debug("StorageService.set: key=%r, value=%r", key, value)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a preference value"""
@@ -64,13 +107,16 @@ class StorageService:
     
     def remove(self, key: str):
         """Remove a preference"""
-        if key in self._preferences:
+        with self._lock:
+            if key not in self._preferences:
+                return
             del self._preferences[key]
-            self._save_preferences()
-            print(f"StorageService.remove: key='{key}'")
+            self._schedule_flush()
+        logger.debug("StorageService.remove: key=%r", key)
     
     def clear(self):
         """Clear all preferences"""
-        self._preferences.clear()
-        self._save_preferences()
-        print("StorageService.clear: all preferences cleared")
+        with self._lock:
+            self._preferences.clear()
+            self._schedule_flush()
+        logger.debug("StorageService.clear: all preferences cleared")
@@ -1,5 +1,33 @@
 """Base ViewModel class for state management"""
 
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, FrozenSet, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+
+def _listener_key(
+    callback: Callable,
+    on_dead: Optional[Callable] = None,
+) -> Union[Callable, weakref.WeakMethod]:
+    """Key used to store a listener: bound methods are held weakly, other callables strongly"""
+    if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+        return weakref.WeakMethod(callback, on_dead)
+    return callback
+
+
+class _BatchState(threading.local):
+    """Open batch() blocks of one thread, and the notifications deferred by them"""
+    
+    def __init__(self):
+        self.depth = 0
+        self.notify_pending = False
+        self.changes: Set[str] = set()
+        self.unspecified = False
+
 
 class BaseViewModel:
     """
@@ -8,10 +36,27 @@ class BaseViewModel:
     
     ViewModels should inherit from this class and use notify_listeners()
     to notify all observers when state changes.
+    
+    Bound-method listeners are held through weak references, so a discarded
+    view does not stay alive (or keep being notified) just because it
+    subscribed. Plain functions and lambdas are held strongly.
+    
+    notify_listeners() may name the kinds of change it reports; listeners read
+    them from the changes property while being notified.
+    
+    Notifications may be raised from worker threads; they are delivered one
+    at a time, so listeners never run concurrently.
     """
     
     def __init__(self):
-        self._listeners = set()
+        # Insertion-ordered set of listener keys (dict keys; values unused)
+        self._listeners: Dict[Union[Callable, weakref.WeakMethod], None] = {}
+        # Kinds of change of the notification being delivered (empty: unspecified)
+        self._changes: FrozenSet[str] = frozenset()
+        # Per thread: a batch() block defers only the notifications raised on its own thread
+        self._batch_state = _BatchState()
+        # Serializes delivery across threads (reentrant: listeners may notify)
+        self._notify_lock = threading.RLock()
     
     def add_listener(self, callback):
         """
@@ -21,7 +66,10 @@ class BaseViewModel:
             callback: Function to call when state changes
         """
         if callable(callback):
-            self._listeners.add(callback)
+            # Drop the entry automatically once the owning object is collected
+            listeners = self._listeners
+            key = _listener_key(callback, lambda ref: listeners.pop(ref, None))
+            self._listeners[key] = None
     
     def remove_listener(self, callback):
         """
@@ -30,18 +78,69 @@ class BaseViewModel:
         Args:
             callback: Callback function to remove
         """
-        self._listeners.discard(callback)
+        self._listeners.pop(_listener_key(callback), None)
+    
+    @property
+    def changes(self) -> FrozenSet[str]:
+        """Kinds of change reported by the current notification (empty means unspecified: assume anything changed)"""
+        return self._changes
     
-    def notify_listeners(self):
+    def notify_listeners(self, *changes: str):
         """
         Notify all registered listeners of state change.
         Should be called whenever state changes.
+        Inside batch() on the same thread the notification is deferred to the end of the block.
+        
+        Args:
+            changes: Optional kinds of change, exposed to listeners as self.changes
         """
-        for callback in self._listeners:
+        batch = self._batch_state
+        if batch.depth:
+            batch.notify_pending = True
+            if changes:
+                batch.changes.update(changes)
+            else:
+                batch.unspecified = True
+            return
+        
+        with self._notify_lock:
+            self._changes = frozenset(changes)
             try:
-                callback()
-            except Exception as e:
-                print(f"Error in listener callback: {e}")
+                # Snapshot so listeners may add/remove listeners while being notified
+                for key in tuple(self._listeners):
+                    callback = key() if isinstance(key, weakref.WeakMethod) else key
+                    if callback is None:
+                        continue
+                    try:
+                        callback()
+                    except Exception:
+                        logger.exception("Error in listener callback %r", callback)
+            finally:
+                # A direct listener call outside a notification sees unspecified kinds
+                self._changes = frozenset()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Collapse the notifications raised inside the block into one.
+        
+        Listeners are notified once when the outermost block exits, and only
+        if notify_listeners() was called inside it on the same thread;
+        notifications from other threads are delivered as usual.
+        """
+        batch = self._batch_state
+        batch.depth += 1
+        try:
+            yield
+        finally:
+            batch.depth -= 1
+            if not batch.depth and batch.notify_pending:
+                # One notification reporting every kind of change deferred by the block
+                changes = () if batch.unspecified else tuple(batch.changes)
+                batch.notify_pending = False
+                batch.changes.clear()
+                batch.unspecified = False
+                self.notify_listeners(*changes)
     
     def dispose(self):
         """
@@ -1,5 +1,11 @@
 """VPK Manager screen"""
 
+import asyncio
+import logging
+import os
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
 try:
     import flet as ft
 except ImportError:
@@ -10,14 +16,124 @@ from features.vpk_manager.viewmodels.vpk_manager_viewmodel import VpkManagerView
 from features.vpk_manager.services.vpk_export_service import VpkExportService
 from core.localization import localization
 
+logger = logging.getLogger(__name__)
+
+# Item rows are a 120px thumbnail plus 10px padding on each side
+ITEM_EXTENT = 140
+ITEM_SPACING = 5
+# Tallest a section's virtualized list may grow before it scrolls internally
+LIST_MAX_HEIGHT = 600
+# Rows materialized per batch; the next batch is built when a list is scrolled near its end
+ROW_BATCH = 60
+# Most thumbnail files probed/swapped in at once when a long list is built
+THUMB_LOAD_CONCURRENCY = 16
+# Seconds (about one frame) to let a burst of ViewModel notifications settle before rebuilding
+REBUILD_DEBOUNCE = 0.016
+# Seconds between refreshes of the elapsed time shown while exporting/deleting
+EXPORT_TICK_INTERVAL = 1.0
+
+# ViewModel notification that needs only the action bar and checkboxes patched
+_SELECTION_ONLY = frozenset((VpkManagerViewModel.CHANGE_SELECTION,))
+
 
-def _safe_print(msg: str):
-    """Safe print that handles encoding errors"""
+def _on_event_loop() -> bool:
+    """Whether the caller runs on an event loop (the page loop; worker threads have none)"""
     try:
-        print(msg)
-    except UnicodeEncodeError:
-        # If encoding fails, replace problematic characters
-        print(msg.encode('utf-8', errors='replace').decode('utf-8', errors='replace'))
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+# Enum members used for every row, resolved once
+_BOLD = ft.FontWeight.BOLD
+_CENTER = ft.CrossAxisAlignment.CENTER
+_ICON_NO_THUMBNAIL = ft.Icons.IMAGE_NOT_SUPPORTED
+
+# Shared control styling (controls themselves cannot be shared between parents)
+_THUMB_IMAGE_STYLE = dict(width=120, height=120, fit=ft.ImageFit.CONTAIN)
+_THUMB_PLACEHOLDER_STYLE = dict(
+    width=120,
+    height=120,
+    bgcolor='#3a3a3a',
+    border_radius=8,
+    alignment=ft.alignment.center,  # Module-level constant in Flet, shared as-is
+)
+# Padding of the "disabled" badge; Padding values are never mutated, so one instance serves every row
+_BADGE_PADDING = ft.padding.symmetric(horizontal=6, vertical=2)
+# Tags of the page-wide file pickers reused by every VpkManagerScreen on a page
+_FOLDER_PICKER_ID = 'vpk_manager.folder_picker'
+_ARCHIVE_PICKER_ID = 'vpk_manager.archive_picker'
+
+_DELETE_BUTTON_STYLE = dict(icon=ft.Icons.DELETE, tooltip='Delete', icon_color='#f44336')
+
+# Row appearance for enabled / disabled VPKs (toggle_* describe the action the button offers)
+_STYLE_ENABLED = dict(
+    name_color='#ffffff',
+    info_color='#a0a0a0',
+    bg='#2d2d2d',
+    opacity=1.0,
+    toggle_icon=ft.Icons.BLOCK,
+    toggle_tooltip='Disable',
+    toggle_color='#ff9800',
+)
+_STYLE_DISABLED = dict(
+    name_color='#888888',
+    info_color='#666666',
+    bg='#1a1a1a',
+    opacity=0.6,
+    toggle_icon=ft.Icons.CHECK_CIRCLE,
+    toggle_tooltip='Enable',
+    toggle_color='#4caf50',
+)
+
+
+def _item_key(path: str) -> str:
+    """Row cache key - stable across enable/disable (.vpk <-> .vpk.disabled renames)"""
+    return path[:-len('.disabled')] if path.endswith('.disabled') else path
+
+
+def _placeholder_thumbnail() -> "ft.Container":
+    """Box shown in place of a missing (or not yet loaded) thumbnail; a fresh control per slot"""
+    return ft.Container(
+        content=ft.Icon(_ICON_NO_THUMBNAIL, size=50, color='#666666'),
+        **_THUMB_PLACEHOLDER_STYLE,
+    )
+
+
+def _collapsed_placeholder() -> "ft.Container":
+    """Stand-in body for a collapsed panel; the real rows are built on expand"""
+    return ft.Container(height=1)
+
+
+def _near_end(e: "ft.OnScrollEvent") -> bool:
+    """Whether a list scroll event is within a few rows of the end of the materialized rows"""
+    return e.pixels >= e.max_scroll_extent - 5 * ITEM_EXTENT
+
+
+def _shared_picker(page: "ft.Page", picker_id: str) -> "ft.FilePicker":
+    """Return the page's FilePicker tagged picker_id, adding it to the overlay on first use"""
+    # The page session doubles as the registry, so the overlay list is never scanned
+    picker = page.session.get(picker_id)
+    if picker is None:
+        picker = ft.FilePicker(data=picker_id)
+        page.overlay.append(picker)
+        page.session.set(picker_id, picker)
+    return picker
+
+
+class _VpkItemView:
+    """References to the mutable controls of one VPK row"""
+    
+    def __init__(self):
+        self.vpk: Optional[VpkFile] = None
+        self.container: Optional["ft.Container"] = None
+        self.row: Optional["ft.Row"] = None
+        self.checkbox: Optional["ft.Checkbox"] = None
+        self.title_text: Optional["ft.Text"] = None
+        self.badge: Optional["ft.Container"] = None
+        self.size_text: Optional["ft.Text"] = None
+        self.thumbnail_path: Optional[str] = None
+        self.toggle_button: Optional["ft.IconButton"] = None  # Local rows only
 
 
 class VpkManagerScreen:
@@ -36,9 +152,34 @@ class VpkManagerScreen:
         self._local_vpk_expanded = True
         self._workshop_expanded = True
         
+        # Section panels are created once; rebuilds only reconfigure them
+        self._local_panel = self._build_section_panel()
+        self._workshop_panel = self._build_section_panel()
+        self._expansion_list = ft.ExpansionPanelList(
+            controls=[self._local_panel, self._workshop_panel],
+            on_change=self._on_panel_change,
+            spacing=12,
+            divider_color='#333333',
+        )
+        
+        # Per-section row lists, refilled in place on every rebuild; only the first
+        # *_row_limit files get rows until the user scrolls further
+        self._local_list_view = self._build_item_list_view(self._on_local_list_scroll)
+        self._workshop_list_view = self._build_item_list_view(self._on_workshop_list_scroll)
+        self._local_row_limit = ROW_BATCH
+        self._workshop_row_limit = ROW_BATCH
+        # [files, key, body] of the last built panel bodies (see _memo_body)
+        self._local_body_memo: list = []
+        self._workshop_body_memo: list = []
+        
+        # Limits concurrent thumbnail loads (see _load_thumbnail)
+        self._thumb_sem = asyncio.BoundedSemaphore(THUMB_LOAD_CONCURRENCY)
+        # Thumbnail files already found on disk; rows rebuilt for them skip the deferred load
+        self._thumb_loaded: set = set()
+        
         # File pickers
-        self._folder_picker = ft.FilePicker(on_result=self._on_folder_selected)
-        self._archive_picker = ft.FilePicker(on_result=self._on_archive_selected)
+        self._folder_picker: Optional[ft.FilePicker] = None  # Bound in set_page()
+        self._archive_picker: Optional[ft.FilePicker] = None  # Bound in set_page()
         
         # Main container reference for dynamic updates
         self._main_column = None
@@ -46,25 +187,53 @@ class VpkManagerScreen:
         self._export_button = None  # Will be created in build()
         self._delete_button = None  # Will be created in build()
         self._selected_count_text = None  # Will be created in build()
+        self._elapsed_text = None  # Elapsed-time text of the progress bar while exporting
+        self._action_bar_stale = False  # Exporting toggled; the next rebuild swaps buttons/progress
+        self._export_ticker = None  # Task refreshing _elapsed_text (see _tick_export_elapsed)
+        
+        # Initial directory scan started by set_page(); until it finishes the
+        # content area shows the loading state instead of an empty list
+        self._preload_task = None
+        self._preload_pending = False
         
         # Track previous state to detect changes
         self._previous_is_loading = False
         self._previous_is_exporting = False
+        self._previous_vpk_files = self._viewmodel.vpk_files
+        self._previous_workshop_files = self._viewmodel.workshop_files
         
-        # Load VPK files if directory was saved
-        if self._current_directory:
-            _safe_print(f"VpkManagerScreen.__init__: loading VPK files from saved directory: {self._current_directory}")
-            self._viewmodel.load_vpk_files_sync(self._current_directory)
+        # Localized "{size} MB" template split around {size}, refreshed once per content-area build
+        self._size_prefix, _, self._size_suffix = localization.t('fileSize').partition('{size}')
+        
+        # Item rows kept across rebuilds, keyed by _item_key(path); patched in place
+        self._local_items: Dict[str, _VpkItemView] = {}
+        self._workshop_items: Dict[str, _VpkItemView] = {}
+        # Selection the cached checkboxes show; _sync_selection patches only the difference
+        self._synced_vpk_selection: frozenset = frozenset()
+        self._synced_workshop_selection: frozenset = frozenset()
+        
+        # Update batching - see _batch_update(), _schedule_update() and _schedule_content_rebuild()
+        self._suppress_update = False
+        self._rebuild_pending = False
+        self._update_scheduled = False
+        self._dirty_page = False
+        # Action bar and checkboxes lag the ViewModel selection until the next flush
+        self._selection_dirty = False
+        # Insertion-ordered set of subtrees awaiting a scoped update
+        self._dirty_controls: Dict["ft.Control", None] = {}
+
     
     def build(self) -> "ft.Container":
         """Build the UI"""
-        # Create directory input with current locale
-        self._directory_input = ft.TextField(
-            label=localization.t('directoryPathLabel'),
-            expand=True,
-            read_only=True,
-            value=self._current_directory,
-        )
+        # Nothing can be shown (or picked) before set_page(); skip building the content
+        if self._page is None:
+            return ft.Container()
+        
+        # Create the directory input once; later builds only refresh its value
+        # (_build_top_bar sets its label for the current locale)
+        if self._directory_input is None:
+            self._directory_input = ft.TextField(expand=True, read_only=True)
+        self._directory_input.value = self._current_directory
         
         # Create action buttons row (will be at top, fixed position)
         self._action_buttons_row = self._build_action_buttons()
@@ -81,7 +250,7 @@ class VpkManagerScreen:
             content=self._main_column,
             expand=True,
             padding=10,
-        ) if self._page is not None else ft.Container()
+        )
     
     def _build_top_bar(self, directory_input: "ft.TextField") -> "ft.Row":
         """Build top bar with directory input and folder button"""
@@ -91,7 +260,7 @@ class VpkManagerScreen:
         
         label_text = localization.t('directoryPathLabel')
         browse_text = localization.t('browseFolder')
-        _safe_print(f"_build_top_bar: label='{label_text}', browse='{browse_text}'")
+        logger.debug("_build_top_bar: label=%r, browse=%r", label_text, browse_text)
         
         directory_input.label = label_text
         
@@ -102,16 +271,19 @@ class VpkManagerScreen:
                 tooltip=browse_text,
                 on_click=on_folder_click,
             ),
-        ], spacing=10, vertical_alignment=ft.CrossAxisAlignment.CENTER)
+        ], spacing=10, vertical_alignment=_CENTER)
     
     def _build_content_area(self) -> "ft.Container":
         """Build content area with action buttons and collapsible sections"""
-        if self._viewmodel.is_loading:
+        # Snapshot the per-row size template once instead of translating per item
+        self._size_prefix, _, self._size_suffix = localization.t('fileSize').partition('{size}')
+        
+        if self._viewmodel.is_loading or self._preload_pending:
             return ft.Container(
                 content=ft.Column([
                     ft.ProgressRing(),
                     ft.Text(localization.t('loading'), size=14),
-                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                ], horizontal_alignment=_CENTER),
                 expand=True,
             )
         
@@ -124,12 +296,12 @@ class VpkManagerScreen:
                         color='red',
                         text_align=ft.TextAlign.CENTER,
                     ),
-                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                ], horizontal_alignment=_CENTER),
                 expand=True,
             )
         
-        # Build the expansion list
-        expansion_list = self._build_expansion_list()
+        # Reconfigure the persistent expansion list
+        expansion_list = self._refresh_expansion_list()
         
         # Wrap in a scrollable container with Column for proper scrolling
         return ft.Container(
@@ -142,22 +314,134 @@ class VpkManagerScreen:
             padding=0,
         )
     
-    def _build_expansion_list(self) -> "ft.ExpansionPanelList":
-        """Build expansion panel list for VPK files"""
-        # Create expansion panels
-        panels = []
-        
-        # Local VPK Files Panel
-        local_vpk_content = ft.Column(
-            controls=[
-                self._build_local_vpk_item(vpk)
-                for vpk in self._viewmodel.vpk_files
-            ],
-            spacing=5,
-        ) if self._viewmodel.vpk_files else ft.Text(
-            localization.t('noLocalVpkFiles'),
-            color='gray',
-            size=14,
+    def _build_section_panel(self) -> "ft.ExpansionPanel":
+        """Create an empty section panel; _refresh_expansion_list fills in its text and body"""
+        placeholder = _collapsed_placeholder()
+        return ft.ExpansionPanel(
+            # Title and subtitle are two spans of one Text rather than a ListTile with two Texts
+            header=ft.Container(
+                content=ft.Text(spans=[
+                    ft.TextSpan(style=ft.TextStyle(weight=_BOLD, size=14, color='#ffffff')),
+                    ft.TextSpan(style=ft.TextStyle(size=11, color='#a0a0a0')),
+                ]),
+                padding=ft.padding.symmetric(horizontal=16, vertical=8),
+            ),
+            content=ft.Container(
+                content=placeholder,
+                padding=15,
+                border_radius=8,
+            ),
+            bgcolor='#242424',
+            can_tap_header=True,
+            # The panel's own collapsed body, reused by every refresh while collapsed
+            data=placeholder,
+        )
+    
+    def _refresh_expansion_list(self) -> "ft.ExpansionPanelList":
+        """Reconfigure the persistent expansion panels for the current state"""
+        self._refresh_section(
+            self._local_panel, 'localVpkFiles', 'localVpkFilesSubtitle',
+            self._viewmodel.vpk_files, self._local_vpk_expanded, self._local_panel_body,
+        )
+        self._refresh_section(
+            self._workshop_panel, 'workshopFiles', 'workshopFilesSubtitle',
+            self._viewmodel.workshop_files, self._workshop_expanded, self._workshop_panel_body,
+        )
+        
+        # Reused bodies may predate the latest selection change
+        self._sync_selection()
+        
+        return self._expansion_list
+    
+    @staticmethod
+    def _refresh_section(panel: "ft.ExpansionPanel", title_key: str, subtitle_key: str,
+                         files: List[VpkFile], expanded: bool, body) -> None:
+        """Set a section panel's header texts and, while it is expanded, its body"""
+        title_span, subtitle_span = panel.header.content.spans
+        title_span.text = f"{localization.t(title_key)} ({len(files)})"
+        subtitle_span.text = '\n' + localization.t(subtitle_key)
+        # The body is only built while the panel is expanded
+        panel.content.content = body() if expanded else panel.data
+        panel.expanded = expanded
+    
+    async def _on_panel_change(self, e):
+        """Track panel expansion and build a section's rows when it is opened (on the page loop)"""
+        # Note: e.data contains the index of the changed panel
+        panel_index = int(e.data) if e.data else -1
+        if panel_index == 0:
+            self._local_vpk_expanded = self._local_panel.expanded
+            if self._local_vpk_expanded:
+                # Build the rows now that the panel is visible
+                self._local_panel.content.content = self._local_panel_body()
+                self._sync_selection()
+                self._schedule_update(self._local_panel)
+        elif panel_index == 1:
+            self._workshop_expanded = self._workshop_panel.expanded
+            if self._workshop_expanded:
+                self._workshop_panel.content.content = self._workshop_panel_body()
+                self._sync_selection()
+                self._schedule_update(self._workshop_panel)
+    
+    def _local_panel_body(self) -> "ft.Control":
+        """Local panel body, rebuilt only when the file list, directory or locale changed"""
+        return self._memo_body(
+            self._local_body_memo,
+            self._viewmodel.vpk_files,
+            (bool(self._current_directory), localization.get_locale()),
+            self._build_local_panel_body,
+        )
+    
+    def _workshop_panel_body(self) -> "ft.Control":
+        """Workshop panel body, rebuilt only when the file list or locale changed"""
+        return self._memo_body(
+            self._workshop_body_memo,
+            self._viewmodel.workshop_files,
+            (localization.get_locale(),),
+            self._build_workshop_panel_body,
+        )
+    
+    @staticmethod
+    def _memo_body(memo: list, files: List[VpkFile], key: tuple, build) -> "ft.Control":
+        """Return memo's body if it was built for this exact files list and key, else build(files) and remember it"""
+        # The list object itself is kept (not its id) so a recycled id can never match
+        if memo and memo[0] is files and memo[1] == (len(files),) + key:
+            return memo[2]
+        body = build(files)
+        memo[:] = [files, (len(files),) + key, body]
+        return body
+    
+    def _sync_local_rows(self, files: List[VpkFile]) -> List["ft.Container"]:
+        """Sync the materialized local rows (the first _local_row_limit of files)"""
+        selected = self._viewmodel.selected_vpk_files
+        rows = self._sync_items(
+            self._local_items,
+            files,
+            selected,
+            self._build_local_vpk_item,
+            self._local_row_limit,
+        )
+        # Every cached row now shows the current selection
+        self._synced_vpk_selection = frozenset(selected)
+        return rows
+    
+    def _sync_workshop_rows(self, files: List[VpkFile]) -> List["ft.Container"]:
+        """Sync the materialized workshop rows (the first _workshop_row_limit of files)"""
+        selected = self._viewmodel.selected_workshop_files
+        rows = self._sync_items(
+            self._workshop_items,
+            files,
+            selected,
+            self._build_workshop_item,
+            self._workshop_row_limit,
+        )
+        # Every cached row now shows the current selection
+        self._synced_workshop_selection = frozenset(selected)
+        return rows
+    
+    def _build_local_panel_body(self, files: List[VpkFile]) -> "ft.Column":
+        """Build the local VPK panel body: upload header plus the file rows"""
+        local_vpk_content = self._build_file_rows(
+            self._local_list_view, files, self._sync_local_rows, 'noLocalVpkFiles',
         )
         
         def on_upload_click(e):
@@ -169,108 +453,105 @@ class VpkManagerScreen:
         # Upload button for archive files
         upload_button = ft.IconButton(
             icon=ft.Icons.UPLOAD_FILE,
-            tooltip=localization.t('uploadArchive') if localization.t('uploadArchive') != 'uploadArchive' else 'Upload Archive',
+            tooltip=localization.t('uploadArchive', default='Upload Archive'),
             on_click=on_upload_click,
             disabled=not self._current_directory,
         )
         
         # Content with upload button
-        content_with_upload = ft.Column([
+        return ft.Column([
             ft.Row([
-                ft.Text(localization.t('localVpkFiles') if localization.t('localVpkFiles') != 'localVpkFiles' else 'Local VPK Files', weight=ft.FontWeight.BOLD, expand=True),
+                ft.Text(
+                    localization.t('localVpkFiles', default='Local VPK Files'),
+                    weight=_BOLD,
+                    expand=True,
+                ),
                 upload_button,
-            ], spacing=10, vertical_alignment=ft.CrossAxisAlignment.CENTER),
+            ], spacing=10, vertical_alignment=_CENTER),
             local_vpk_content,
         ], spacing=10)
-        
-        local_vpk_panel = ft.ExpansionPanel(
-            header=ft.ListTile(
-                title=ft.Text(
-                    f"{localization.t('localVpkFiles')} ({len(self._viewmodel.vpk_files)})",
-                    weight=ft.FontWeight.BOLD,
-                    size=14,
-                    color='#ffffff',
-                ),
-                subtitle=ft.Text(localization.t('localVpkFilesSubtitle'), size=11, color='#a0a0a0'),
-            ),
-            content=ft.Container(
-                content=content_with_upload,
-                padding=15,
-                border_radius=8,
-            ),
-            expanded=self._local_vpk_expanded,
-            bgcolor='#242424',
-            can_tap_header=True,
-        )
-        panels.append(local_vpk_panel)
-        
-        # Workshop Files Panel
-        workshop_content = ft.Column(
-            controls=[
-                self._build_workshop_item(workshop)
-                for workshop in self._viewmodel.workshop_files
-            ],
-            spacing=5,
-        ) if self._viewmodel.workshop_files else ft.Text(
-            localization.t('noWorkshopFiles'),
-            color='gray',
-            size=14,
+    
+    def _build_workshop_panel_body(self, files: List[VpkFile]) -> "ft.Control":
+        """Build the workshop panel body: the file rows"""
+        return self._build_file_rows(
+            self._workshop_list_view, files, self._sync_workshop_rows, 'noWorkshopFiles',
         )
-        
-        workshop_panel = ft.ExpansionPanel(
-            header=ft.ListTile(
-                title=ft.Text(
-                    f"{localization.t('workshopFiles')} ({len(self._viewmodel.workshop_files)})",
-                    weight=ft.FontWeight.BOLD,
-                    size=14,
-                    color='#ffffff',
-                ),
-                subtitle=ft.Text(localization.t('workshopFilesSubtitle'), size=11, color='#a0a0a0'),
-            ),
-            content=ft.Container(
-                content=workshop_content,
-                padding=15,
-                border_radius=8,
+    
+    def _build_file_rows(self, list_view: "ft.Container", files: List[VpkFile],
+                         sync_rows, empty_key: str) -> "ft.Control":
+        """A section's row list, or its localized empty-state text when it has no files"""
+        if not files:
+            return ft.Text(localization.t(empty_key), color='gray', size=14)
+        return self._fill_item_list_view(list_view, sync_rows(files), len(files))
+    
+    def _build_item_list_view(self, on_scroll) -> "ft.Container":
+        """Create an empty virtualized ListView with a bounded height (filled by _fill_item_list_view)"""
+        # ListView only builds the rows that are scrolled into view; it needs a
+        # bounded height inside the outer scrolling column
+        return ft.Container(
+            content=ft.ListView(
+                controls=[],
+                spacing=ITEM_SPACING,
+                item_extent=ITEM_EXTENT,
+                # Lay out rows lazily on the client with one row of off-screen margin
+                build_controls_on_demand=True,
+                cache_extent=ITEM_EXTENT,
+                expand=True,
+                on_scroll=on_scroll,
+                on_scroll_interval=100,
             ),
-            expanded=self._workshop_expanded,
-            bgcolor='#242424',
-            can_tap_header=True,
-        )
-        panels.append(workshop_panel)
-        
-        # Create expansion panel list with change handler
-        def on_panel_change(e):
-            # Update state based on which panels are expanded
-            # Note: e.data contains the index of the changed panel
-            panel_index = int(e.data) if e.data else -1
-            if panel_index == 0:
-                self._local_vpk_expanded = panels[0].expanded
-            elif panel_index == 1:
-                self._workshop_expanded = panels[1].expanded
-        
-        expansion_list = ft.ExpansionPanelList(
-            controls=panels,
-            on_change=on_panel_change,
-            spacing=12,
-            divider_color='#333333',
         )
-        
-        return expansion_list
+    
+    def _fill_item_list_view(self, list_view: "ft.Container", items: list, total: int) -> "ft.Container":
+        """Swap a section's rows into its persistent ListView in one assignment"""
+        # Size for every file, not just the materialized batch, so the section height stays put
+        list_view.height = min(total * ITEM_EXTENT + (total - 1) * ITEM_SPACING, LIST_MAX_HEIGHT)
+        list_view.content.controls[:] = items
+        return list_view
+    
+    async def _on_local_list_scroll(self, e: "ft.OnScrollEvent"):
+        """Materialize the next batch of local rows when scrolled near the end (on the page loop)"""
+        files = self._viewmodel.vpk_files
+        if _near_end(e) and self._local_row_limit < len(files):
+            self._local_row_limit += ROW_BATCH
+            self._extend_rows(self._local_list_view, self._sync_local_rows(files))
+    
+    async def _on_workshop_list_scroll(self, e: "ft.OnScrollEvent"):
+        """Materialize the next batch of workshop rows when scrolled near the end (on the page loop)"""
+        files = self._viewmodel.workshop_files
+        if _near_end(e) and self._workshop_row_limit < len(files):
+            self._workshop_row_limit += ROW_BATCH
+            self._extend_rows(self._workshop_list_view, self._sync_workshop_rows(files))
+    
+    def _reset_row_limits(self):
+        """Start both sections at the first batch of rows again (a new directory's lists)"""
+        self._local_row_limit = ROW_BATCH
+        self._workshop_row_limit = ROW_BATCH
+    
+    @staticmethod
+    def _extend_rows(list_view: "ft.Container", rows: List["ft.Container"]):
+        """Refill a section's ListView after its row limit grew"""
+        list_view.content.controls[:] = rows
+        list_view.update()
     
     def _build_action_buttons(self) -> "ft.Row":
         """Build action buttons for selected files"""
+        return ft.Row(self._action_bar_controls(), spacing=10, vertical_alignment=_CENTER)
+    
+    def _action_bar_controls(self) -> List["ft.Control"]:
+        """Action bar contents: the export/delete buttons, or the progress row while exporting"""
         def on_export_click(e):
             """Handle export button click"""
             if self._viewmodel.is_exporting:
-                _safe_print("on_export_click: already exporting, ignoring click")
+                logger.debug("on_export_click: already exporting, ignoring click")
                 return
             
             selected_files = self._viewmodel.get_selected_files()
             if not selected_files:
-                _safe_print("on_export_click: no files selected")
+                logger.debug("on_export_click: no files selected")
                 return
             
-            _safe_print(f"on_export_click: exporting {len(selected_files)} files")
+            logger.debug("on_export_click: exporting %s files", len(selected_files))
             downloads_dir = VpkExportService.get_downloads_directory()
             # Use the ViewModel's export method which handles state management
             self._viewmodel.export_selected_vpk_files_sync(downloads_dir)
@@ -278,15 +559,15 @@ class VpkManagerScreen:
         def on_delete_click(e):
             """Handle delete selected files button click"""
             if self._viewmodel.is_exporting:
-                _safe_print("on_delete_click: already processing, ignoring click")
+                logger.debug("on_delete_click: already processing, ignoring click")
                 return
             
             selected_files = self._viewmodel.get_selected_files()
             if not selected_files:
-                _safe_print("on_delete_click: no files selected")
+                logger.debug("on_delete_click: no files selected")
                 return
             
-            _safe_print(f"on_delete_click: deleting {len(selected_files)} files")
+            logger.debug("on_delete_click: deleting %s files", len(selected_files))
             # Use the ViewModel's delete method which handles state management
             self._viewmodel.delete_selected_vpk_files_sync()
         
@@ -296,14 +577,16 @@ class VpkManagerScreen:
         if self._viewmodel.is_exporting:
             # Show loading indicator when exporting with elapsed time
             elapsed_time_text = self._viewmodel.export_elapsed_time_display if self._viewmodel.export_elapsed_time > 0 else '初始化中...'
+            self._elapsed_text = ft.Text(f'耗时: {elapsed_time_text}', expand=True, text_align=ft.TextAlign.RIGHT, color='#a0a0a0', size=12)
             buttons.append(
                 ft.Row([
                     ft.ProgressRing(value=None, width=30, height=30),
                     ft.Text('正在导出/删除文件...', expand=False),
-                    ft.Text(f'耗时: {elapsed_time_text}', expand=True, text_align=ft.TextAlign.RIGHT, color='#a0a0a0', size=12),
-                ], spacing=10, vertical_alignment=ft.CrossAxisAlignment.CENTER, expand=True)
+                    self._elapsed_text,
+                ], spacing=10, vertical_alignment=_CENTER, expand=True)
             )
         else:
+            self._elapsed_text = None
             # Show normal buttons when not exporting
             self._export_button = ft.ElevatedButton(
                 text='导出',
@@ -329,334 +612,456 @@ class VpkManagerScreen:
                 self._selected_count_text,
             ])
         
-        return ft.Row(buttons, spacing=10, vertical_alignment=ft.CrossAxisAlignment.CENTER)
+        return buttons
     
-    def _build_local_vpk_item(self, vpk: VpkFile) -> "ft.Container":
-        """Build a single local VPK item with checkbox, thumbnail, filename, and action buttons"""
-        # Check if this VPK is selected
-        is_selected = vpk.path in self._viewmodel.selected_vpk_files
-        
-        # Build thumbnail image or placeholder
-        if vpk.thumbnail_path:
-            thumbnail = ft.Image(
-                src=vpk.thumbnail_path,
-                width=120,
-                height=120,
-                fit=ft.ImageFit.CONTAIN,
+    async def _tick_export_elapsed(self):
+        """Refresh only the elapsed-time text while exporting, once per EXPORT_TICK_INTERVAL"""
+        try:
+            while True:
+                await asyncio.sleep(EXPORT_TICK_INTERVAL)
+                elapsed_text = self._elapsed_text
+                if elapsed_text is None or not self._viewmodel.is_exporting:
+                    return
+                if elapsed_text.page is not None:
+                    elapsed_text.value = f'耗时: {self._viewmodel.export_elapsed_time_display}'
+                    elapsed_text.update()
+        finally:
+            self._export_ticker = None
+    
+    def _sync_items(self, cache: Dict[str, "_VpkItemView"], files: List[VpkFile],
+                    selected: set, builder, limit: int) -> List["ft.Container"]:
+        """Diff the first limit files against cached item views: patch existing rows, recycle or build new ones"""
+        files = files[:limit]
+        keys: List[str] = [''] * len(files)
+        seen = set()
+        for i, vpk in enumerate(files):
+            key = _item_key(vpk.path)
+            if key in seen:
+                # Both name.vpk and name.vpk.disabled exist - key the second by its real path
+                key = vpk.path
+            seen.add(key)
+            keys[i] = key
+        
+        # Rows whose file is gone are re-pointed at new files instead of being rebuilt
+        pool = [item for key, item in cache.items() if key not in seen]
+        
+        # Pre-sized result and hoisted lookups keep the per-row loop overhead down
+        containers: List[Optional["ft.Container"]] = [None] * len(files)
+        live: Dict[str, _VpkItemView] = {}
+        cached = cache.get
+        apply_state = self._apply_item_state
+        for i, vpk in enumerate(files):
+            key = keys[i]
+            item = cached(key)
+            if item is None:
+                item = pool.pop() if pool else None
+            if item is None:
+                item = builder(vpk, selected)
+            else:
+                apply_state(item, vpk, vpk.path in selected)
+            live[key] = item
+            containers[i] = item.container
+        cache.clear()
+        cache.update(live)
+        return containers
+    
+    def _sync_selection(self):
+        """Reflect ViewModel selection in the cached checkboxes (selecting in one section clears the other)"""
+        # Collapsed sections are synced when they are expanded again (see _on_panel_change)
+        if self._local_vpk_expanded:
+            self._synced_vpk_selection = self._patch_checkboxes(
+                self._local_items, self._viewmodel.selected_vpk_files, self._synced_vpk_selection,
             )
-        else:
-            # Show placeholder if no thumbnail
-            thumbnail = ft.Container(
-                content=ft.Icon(ft.Icons.IMAGE_NOT_SUPPORTED, size=50, color='#666666'),
-                width=120,
-                height=120,
-                bgcolor='#3a3a3a',
-                border_radius=8,
-                alignment=ft.alignment.center,
+        if self._workshop_expanded:
+            self._synced_workshop_selection = self._patch_checkboxes(
+                self._workshop_items, self._viewmodel.selected_workshop_files, self._synced_workshop_selection,
             )
+    
+    @staticmethod
+    def _patch_checkboxes(items: Dict[str, "_VpkItemView"], selected: set, synced: frozenset) -> frozenset:
+        """Set only the checkboxes whose path entered or left the selection since synced; returns the new snapshot"""
+        for path in selected.symmetric_difference(synced):
+            item = items.get(_item_key(path))
+            if item is None or item.vpk.path != path:
+                # Keyed by its real path when name.vpk and name.vpk.disabled both exist
+                item = items.get(path)
+            if item is not None:
+                item.checkbox.value = path in selected
+        return frozenset(selected)
+    
+    def _build_thumbnail(self, thumbnail_path: Optional[str]) -> "ft.Control":
+        """Build thumbnail placeholder; the image is swapped in by _load_thumbnail"""
+        if not thumbnail_path:
+            return _placeholder_thumbnail()
+        if self._page is None or thumbnail_path in self._thumb_loaded:
+            # Already probed (or no loop to defer to): show the image straight away
+            return ft.Image(src=thumbnail_path, **_THUMB_IMAGE_STYLE)
         
-        # Build filename and info
-        name_text_color = '#888888' if vpk.is_disabled else '#ffffff'
-        info_text_color = '#666666' if vpk.is_disabled else '#a0a0a0'
-        
-        # Build title with addontitle if available
-        title_parts = [vpk.name]
-        if vpk.addontitle:
-            title_parts.append(f" - {vpk.addontitle}")
-        title_text = ''.join(title_parts)
+        holder = ft.Container(content=_placeholder_thumbnail(), width=120, height=120)
+        self._page.run_task(self._load_thumbnail, holder, thumbnail_path)
+        return holder
+    
+    async def _load_thumbnail(self, holder: "ft.Container", thumbnail_path: str):
+        """Replace a thumbnail placeholder with the image, a bounded number at a time"""
+        async with self._thumb_sem:
+            exists = await asyncio.to_thread(os.path.isfile, thumbnail_path)
+            if not exists:
+                return
+            self._thumb_loaded.add(thumbnail_path)
+            holder.content = ft.Image(src=thumbnail_path, **_THUMB_IMAGE_STYLE)
+            try:
+                holder.update()
+            except Exception:
+                # Not mounted yet (or row already replaced); the image shows when it is
+                pass
+    
+    def _build_item_view(self, vpk: VpkFile, on_checkbox_change,
+                         action_buttons: Optional["ft.Row"] = None) -> "_VpkItemView":
+        """Build the controls shared by local and workshop rows (state applied separately)"""
+        item = _VpkItemView()
+        item.checkbox = ft.Checkbox(on_change=on_checkbox_change)
+        item.title_text = ft.Text(weight=_BOLD, size=16)
+        item.badge = ft.Container(
+            content=ft.Text('已禁用', size=9, color='#ffffff', weight=_BOLD),
+            bgcolor='#f44336',
+            padding=_BADGE_PADDING,
+            border_radius=4,
+        )
+        item.size_text = ft.Text(size=11)
+        item.thumbnail_path = vpk.thumbnail_path
         
         file_info = ft.Column([
             ft.Row([
-                ft.Text(title_text, weight=ft.FontWeight.BOLD, size=16, color=name_text_color),
-                ft.Container(
-                    content=ft.Text('已禁用', size=9, color='#ffffff', weight=ft.FontWeight.BOLD),
-                    bgcolor='#f44336',
-                    padding=ft.padding.symmetric(horizontal=6, vertical=2),
-                    border_radius=4,
-                    visible=vpk.is_disabled,
-                ),
-            ], spacing=8, vertical_alignment=ft.CrossAxisAlignment.CENTER),
-            ft.Text(
-                localization.t('fileSize', size=f'{vpk.size / (1024*1024):.2f}'),
-                size=11,
-                color=info_text_color,
-            ),
+                item.title_text,
+                item.badge,
+            ], spacing=8, vertical_alignment=_CENTER),
+            item.size_text,
         ], tight=True, expand=True)
         
-        # Create action buttons based on disabled state
-        def on_checkbox_change(e):
-            """Handle checkbox change"""
-            _safe_print(f"_build_local_vpk_item: checkbox changed for {vpk.name}, value={e.control.value}")
-            self._viewmodel.toggle_vpk_selection(vpk)
+        row_controls = [item.checkbox, self._build_thumbnail(vpk.thumbnail_path), file_info]
+        if action_buttons is not None:
+            row_controls.append(action_buttons)
+        item.row = ft.Row(row_controls, spacing=10, vertical_alignment=_CENTER)
+        item.container = ft.Container(
+            content=item.row,
+            padding=10,
+            border_radius=4,
+        )
+        return item
+    
+    def _apply_item_state(self, item: "_VpkItemView", vpk: VpkFile, is_selected: bool):
+        """Patch a row's controls in place to reflect a (possibly changed) VpkFile"""
+        item.vpk = vpk
+        item.checkbox.value = is_selected
         
-        def on_disable_click(e):
-            """Handle disable button click"""
-            _safe_print(f"_build_local_vpk_item: disabling {vpk.name}")
-            self._viewmodel.disable_vpk_sync(vpk)
+        item.title_text.value = vpk.display_title
         
-        def on_enable_click(e):
-            """Handle enable button click"""
-            _safe_print(f"_build_local_vpk_item: enabling {vpk.name}")
-            self._viewmodel.enable_vpk_sync(vpk)
+        style = _STYLE_DISABLED if vpk.is_disabled else _STYLE_ENABLED
+        item.title_text.color = style['name_color']
+        item.badge.visible = vpk.is_disabled
+        item.size_text.value = self._size_prefix + vpk.size_mb_str + self._size_suffix
+        item.size_text.color = style['info_color']
         
-        def on_delete_click(e):
-            """Handle delete button click"""
-            _safe_print(f"_build_local_vpk_item: deleting {vpk.name}")
-            self._viewmodel.delete_vpk_sync(vpk)
+        # Apply disabled visual style if disabled
+        item.row.opacity = style['opacity']
+        item.container.bgcolor = style['bg']
         
-        # Checkbox for selection
-        checkbox = ft.Checkbox(
-            value=is_selected,
-            on_change=on_checkbox_change,
-        )
+        if item.thumbnail_path != vpk.thumbnail_path:
+            item.row.controls[1] = self._build_thumbnail(vpk.thumbnail_path)
+            item.thumbnail_path = vpk.thumbnail_path
         
-        if vpk.is_disabled:
-            # Show "Enable" and "Delete" buttons for disabled files
-            action_buttons = ft.Row([
-                ft.IconButton(
-                    icon=ft.Icons.CHECK_CIRCLE,
-                    tooltip='Enable',
-                    on_click=on_enable_click,
-                    icon_color='#4caf50',
-                ),
-                ft.IconButton(
-                    icon=ft.Icons.DELETE,
-                    tooltip='Delete',
-                    on_click=on_delete_click,
-                    icon_color='#f44336',
-                ),
-            ], spacing=5)
-        else:
-            # Show "Disable" and "Delete" buttons for enabled files
-            action_buttons = ft.Row([
-                ft.IconButton(
-                    icon=ft.Icons.BLOCK,
-                    tooltip='Disable',
-                    on_click=on_disable_click,
-                    icon_color='#ff9800',
-                ),
-                ft.IconButton(
-                    icon=ft.Icons.DELETE,
-                    tooltip='Delete',
-                    on_click=on_delete_click,
-                    icon_color='#f44336',
-                ),
-            ], spacing=5)
+        if item.toggle_button is not None:
+            # Show "Enable" for disabled files and "Disable" for enabled files
+            item.toggle_button.icon = style['toggle_icon']
+            item.toggle_button.tooltip = style['toggle_tooltip']
+            item.toggle_button.icon_color = style['toggle_color']
+    
+    def _build_local_vpk_item(self, vpk: VpkFile, selected: set) -> "_VpkItemView":
+        """Build a single local VPK item with checkbox, thumbnail, filename, and action buttons"""
+        item = None
         
-        # Build filename and info with action buttons
-        item_content = ft.Row([
-            checkbox,
-            thumbnail,
-            file_info,
-            action_buttons,
-        ], spacing=10, vertical_alignment=ft.CrossAxisAlignment.CENTER, opacity=0.6 if vpk.is_disabled else 1.0)
+        def on_checkbox_change(e):
+            """Handle checkbox change"""
+            logger.debug("_build_local_vpk_item: checkbox changed for %s, value=%s", item.vpk.name, e.control.value)
+            self._viewmodel.toggle_vpk_selection(item.vpk)
         
-        # Apply disabled visual style if disabled
-        bgcolor = '#2d2d2d'
-        if vpk.is_disabled:
-            bgcolor = '#1a1a1a'
+        def on_toggle_click(e):
+            """Handle enable/disable button click"""
+            if item.vpk.is_disabled:
+                logger.debug("_build_local_vpk_item: enabling %s", item.vpk.name)
+                self._viewmodel.enable_vpk_sync(item.vpk)
+            else:
+                logger.debug("_build_local_vpk_item: disabling %s", item.vpk.name)
+                self._viewmodel.disable_vpk_sync(item.vpk)
         
-        return ft.Container(
-            content=item_content,
-            padding=10,
-            border_radius=4,
-            bgcolor=bgcolor,
-        )
-    
-    def _build_workshop_item(self, workshop: VpkFile) -> "ft.Container":
-        """Build a single workshop item with checkbox, thumbnail and filename"""
-        # Check if this workshop file is selected
-        is_selected = workshop.path in self._viewmodel.selected_workshop_files
-        
-        # Build thumbnail image or placeholder
-        if workshop.thumbnail_path:
-            thumbnail = ft.Image(
-                src=workshop.thumbnail_path,
-                width=120,
-                height=120,
-                fit=ft.ImageFit.CONTAIN,
-            )
-        else:
-            # Show placeholder if no thumbnail
-            thumbnail = ft.Container(
-                content=ft.Icon(ft.Icons.IMAGE_NOT_SUPPORTED, size=50, color='#666666'),
-                width=120,
-                height=120,
-                bgcolor='#3a3a3a',
-                border_radius=8,
-                alignment=ft.alignment.center,
-            )
+        def on_delete_click(e):
+            """Handle delete button click"""
+            logger.debug("_build_local_vpk_item: deleting %s", item.vpk.name)
+            self._viewmodel.delete_vpk_sync(item.vpk)
         
-        # Build filename and info
-        name_text_color = '#888888' if workshop.is_disabled else '#ffffff'
-        info_text_color = '#666666' if workshop.is_disabled else '#a0a0a0'
+        toggle_button = ft.IconButton(on_click=on_toggle_click)
+        action_buttons = ft.Row([
+            toggle_button,
+            ft.IconButton(on_click=on_delete_click, **_DELETE_BUTTON_STYLE),
+        ], spacing=5)
         
-        # Build title with addontitle if available
-        title_parts = [workshop.name]
-        if workshop.addontitle:
-            title_parts.append(f" - {workshop.addontitle}")
-        title_text = ''.join(title_parts)
+        item = self._build_item_view(vpk, on_checkbox_change, action_buttons)
+        item.toggle_button = toggle_button
+        self._apply_item_state(item, vpk, vpk.path in selected)
+        return item
+    
+    def _build_workshop_item(self, workshop: VpkFile, selected: set) -> "_VpkItemView":
+        """Build a single workshop item with checkbox, thumbnail and filename"""
+        item = None
         
-        # Checkbox for selection
         def on_checkbox_change(e):
             """Handle checkbox change"""
-            _safe_print(f"_build_workshop_item: checkbox changed for {workshop.name}, value={e.control.value}")
-            self._viewmodel.toggle_workshop_selection(workshop)
-        
-        checkbox = ft.Checkbox(
-            value=is_selected,
-            on_change=on_checkbox_change,
-        )
-        
-        item_content = ft.Row([
-            checkbox,
-            thumbnail,
-            ft.Column([
-                ft.Row([
-                    ft.Text(title_text, weight=ft.FontWeight.BOLD, size=16, color=name_text_color),
-                    ft.Container(
-                        content=ft.Text('已禁用', size=9, color='#ffffff', weight=ft.FontWeight.BOLD),
-                        bgcolor='#f44336',
-                        padding=ft.padding.symmetric(horizontal=6, vertical=2),
-                        border_radius=4,
-                        visible=workshop.is_disabled,
-                    ),
-                ], spacing=8, vertical_alignment=ft.CrossAxisAlignment.CENTER),
-                ft.Text(
-                    localization.t('fileSize', size=f'{workshop.size / (1024*1024):.2f}'),
-                    size=11,
-                    color=info_text_color,
-                ),
-            ], tight=True, expand=True),
-        ], spacing=10, vertical_alignment=ft.CrossAxisAlignment.CENTER, opacity=0.6 if workshop.is_disabled else 1.0)
+            logger.debug("_build_workshop_item: checkbox changed for %s, value=%s", item.vpk.name, e.control.value)
+            self._viewmodel.toggle_workshop_selection(item.vpk)
         
-        return ft.Container(
-            content=item_content,
-            padding=10,
-            border_radius=4,
-            bgcolor='#1a1a1a' if workshop.is_disabled else '#2d2d2d',
-        )
+        item = self._build_item_view(workshop, on_checkbox_change)
+        self._apply_item_state(item, workshop, workshop.path in selected)
+        return item
     
     def _on_folder_selected(self, e: "ft.FilePickerResultEvent"):
         """Handle folder selection from system file picker"""
         if e.path:
             self._current_directory = e.path
-            _safe_print(f"_on_folder_selected: selected path={e.path}")
-            
-            # Update the directory_input TextField directly
-            if self._directory_input:
-                self._directory_input.value = e.path
-                _safe_print(f"_on_folder_selected: updated _directory_input.value to {e.path}")
+            logger.debug("_on_folder_selected: selected path=%s", e.path)
+            # The rows grown by scrolling the previous directory do not carry over
+            self._reset_row_limits()
             
-            # Update ViewModel to load VPK files
-            self._viewmodel.set_directory_sync(e.path)
-            _safe_print(f"_on_folder_selected: called set_directory_sync({e.path})")
-            
-            # Trigger UI update
-            if self._page:
-                self._page.update()
-                _safe_print(f"_on_folder_selected: called page.update()")
-    
-    def _show_folder_picker(self):
-        """Show system folder picker"""
-        def on_dialog_close(e):
-            if dialog.data:
-                path = path_input.value
-                if path:
-                    import asyncio
-                    asyncio.create_task(self._viewmodel.set_directory(path))
-        
-        path_input = ft.TextField(
-            label=localization.t('enterFolderPath'),
-            width=400,
-        )
+            # Apply the TextField change and the reload as a single page update
+            with self._batch_update():
+                # Update the directory_input TextField directly
+                if self._directory_input:
+                    self._directory_input.value = e.path
+                    logger.debug("_on_folder_selected: updated _directory_input.value to %s", e.path)
+                
+                # Scan on the page's event loop (worker thread) instead of this handler
+                if self._page is not None:
+                    self._page.run_task(self._viewmodel.set_directory, e.path)
+                else:
+                    self._viewmodel.set_directory_sync(e.path)
+                logger.debug("_on_folder_selected: scheduled set_directory(%s)", e.path)
+    
+    def set_page(self, page: "ft.Page"):
+        """Set page reference for dialogs and file pickers"""
+        pickers_bound = page is self._page and self._folder_picker is not None
+        self._page = page
         
-        dialog = ft.AlertDialog(
-            title=ft.Text(localization.t('selectDirectory')),
-            content=path_input,
-            actions=[
-                ft.TextButton(localization.t('cancel'), on_click=lambda e: self._close_dialog(dialog)),
-                ft.TextButton(
-                    localization.t('ok'),
-                    on_click=lambda e: self._handle_path_selected(path_input.value or '', dialog),
-                ),
-            ],
-        )
+        # Load VPK files for the saved directory off the UI path; the first paint
+        # shows the loading state (or the lists restored from the last session)
+        # and _on_state_changed swaps in the results
+        if self._current_directory and self._preload_task is None:
+            logger.debug("set_page: scheduling VPK load from saved directory: %s", self._current_directory)
+            self._preload_pending = not self._viewmodel.has_restored_listing
+            self._preload_task = self._page.run_task(self._preload_directory)
         
-        if self._page:
-            self._page.dialog = dialog
-            dialog.open = True
-            self._page.update()
+        if pickers_bound:
+            return
+        
+        # Reuse the page's file pickers and point them at this screen
+        self._folder_picker = _shared_picker(self._page, _FOLDER_PICKER_ID)
+        self._folder_picker.on_result = self._on_folder_selected
+        self._archive_picker = _shared_picker(self._page, _ARCHIVE_PICKER_ID)
+        self._archive_picker.on_result = self._on_archive_selected
     
-    def _handle_path_selected(self, path: str, dialog: "ft.AlertDialog"):
-        """Handle path selection from dialog"""
-        import asyncio
-        dialog.open = False
-        if self._page:
-            self._page.update()
-        if path:
-            self._current_directory = path
-            asyncio.create_task(self._viewmodel.set_directory(path))
-        self._on_state_changed()
-    
-    def _close_dialog(self, dialog: "ft.AlertDialog"):
-        """Close dialog"""
-        dialog.open = False
-        if self._page:
+    async def _preload_directory(self):
+        """Initial scan of the saved directory (scheduled by set_page)"""
+        try:
+            # Restored lists stay on screen while they are rescanned
+            await self._viewmodel.load_vpk_files(
+                self._current_directory,
+                show_loading=not self._viewmodel.has_restored_listing,
+            )
+        finally:
+            # The content area showed the loading state while this was pending
+            self._preload_pending = False
+            if self._page and self._main_column:
+                self._schedule_content_rebuild()
+    
+    @contextmanager
+    def _batch_update(self):
+        """Suppress page updates inside the block and send a single update at the end"""
+        if self._suppress_update:
+            # Already batching - the outermost block sends the update
+            yield
+            return
+        self._suppress_update = True
+        try:
+            yield
+        finally:
+            self._suppress_update = False
+            self._apply_selection_state()
+            # A queued content rebuild sends a full page update that carries these changes too
+            if not self._rebuild_pending:
+                self._update_page()
+    
+    def _update_page(self):
+        """Send pending control changes to the client unless a batch is open"""
+        if self._page and not self._suppress_update:
             self._page.update()
     
-    def set_page(self, page: "ft.Page"):
-        """Set page reference for dialogs and file pickers"""
-        self._page = page
-        # Add file pickers to page
-        if self._folder_picker not in self._page.overlay:
-            self._page.overlay.append(self._folder_picker)
-        if self._archive_picker not in self._page.overlay:
-            self._page.overlay.append(self._archive_picker)
+    def _schedule_update(self, *controls: "ft.Control"):
+        """Send control changes on the page loop after REBUILD_DEBOUNCE, one update per burst
+        
+        With controls, only those subtrees are diffed and sent; without, the whole page is.
+        """
+        if not self._page or self._suppress_update:
+            # No page yet, or a batch will send the update
+            return
+        if controls:
+            self._dirty_controls.update(dict.fromkeys(controls))
+        else:
+            self._dirty_page = True
+        if self._update_scheduled:
+            return
+        self._update_scheduled = True
+        self._page.run_task(self._flush_update)
+    
+    async def _flush_update(self):
+        """Deferred page update for _schedule_update"""
+        await asyncio.sleep(REBUILD_DEBOUNCE)
+        self._update_scheduled = False
+        if not self._suppress_update:
+            self._apply_selection_state()
+        dirty = [control for control in self._dirty_controls if control.page is not None]
+        self._dirty_controls.clear()
+        if self._dirty_page:
+            self._dirty_page = False
+            self._update_page()
+        elif dirty and self._page and not self._suppress_update:
+            self._page.update(*dirty)
+    
+    def _schedule_content_rebuild(self):
+        """Rebuild the content area on the page loop, coalescing repeated requests"""
+        if self._rebuild_pending:
+            return
+        self._rebuild_pending = True
+        self._page.run_task(self._rebuild_content_area)
+    
+    async def _rebuild_content_area(self):
+        """Deferred content-area rebuild (one per burst of state changes)"""
+        await asyncio.sleep(REBUILD_DEBOUNCE)
+        self._rebuild_pending = False
+        if not (self._page and self._main_column):
+            return
+        self._main_column.controls[2] = self._build_content_area()
+        if self._action_bar_stale and self._action_buttons_row:
+            # Swap between the buttons and the progress row
+            self._action_bar_stale = False
+            self._action_buttons_row.controls = self._action_bar_controls()
+            if self._elapsed_text is not None and self._export_ticker is None:
+                self._export_ticker = self._page.run_task(self._tick_export_elapsed)
+        self._apply_selection_state()
+        self._update_page()
+        logger.debug("_rebuild_content_area: page.update() completed")
+    
+    def _apply_selection_state(self):
+        """Bring the action bar and row checkboxes up to date with the ViewModel selection"""
+        if not (self._selection_dirty and self._action_buttons_row):
+            return
+        self._selection_dirty = False
+        viewmodel = self._viewmodel
+        has_selected_files = viewmodel.has_selected_files
+        self._action_buttons_row.visible = has_selected_files or viewmodel.is_exporting
+        
+        # Update button states and text
+        if self._export_button and self._delete_button and self._selected_count_text:
+            self._export_button.disabled = not has_selected_files
+            self._delete_button.disabled = not has_selected_files
+            self._selected_count_text.value = f"已选择 {viewmodel.selected_count} 项"
+            self._sync_selection()
+            logger.debug("_apply_selection_state: updated button disabled states - has_selected=%s", has_selected_files)
     
     def _on_state_changed(self):
-        """Handle state changes from ViewModel"""
-        # Handle state changes from ViewModel
-        _safe_print(f"_on_state_changed: called, is_loading={self._viewmodel.is_loading}, is_exporting={self._viewmodel.is_exporting}, selected_count={self._viewmodel.selected_count}")
+        """Handle state changes from ViewModel (applied on the page loop)"""
+        # Notifications arrive on worker threads (scans, file operations, the title thread);
+        # controls, row caches and the pending-update state are only touched on the page loop
+        changes = self._viewmodel.changes
+        if self._page is not None and not _on_event_loop():
+            self._page.run_task(self._apply_state_change_async, changes)
+            return
+        self._apply_state_change(changes)
+    
+    async def _apply_state_change_async(self, changes: frozenset):
+        """_apply_state_change on the page loop for a notification raised on another thread"""
+        self._apply_state_change(changes)
+    
+    def _apply_state_change(self, changes: frozenset):
+        """Bring the screen up to date with the ViewModel; changes are the notification's kinds"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("_apply_state_change: called, is_loading=%s, is_exporting=%s, selected_count=%s", self._viewmodel.is_loading, self._viewmodel.is_exporting, self._viewmodel.selected_count)
+        
+        viewmodel = self._viewmodel
+        if (changes == _SELECTION_ONLY and self._page and self._action_buttons_row
+                and not self._rebuild_pending):
+            # Only the selection changed: files and loading state are as last seen
+            self._selection_dirty = True
+            self._schedule_update(self._action_buttons_row, self._local_list_view, self._workshop_list_view)
+            return
+        
+        # Snapshot the ViewModel state read below
+        is_loading = viewmodel.is_loading
+        is_exporting = viewmodel.is_exporting
+        vpk_files = viewmodel.vpk_files
+        workshop_files = viewmodel.workshop_files
         
         # Check if loading or exporting state changed
-        loading_state_changed = self._previous_is_loading != self._viewmodel.is_loading
-        exporting_state_changed = self._previous_is_exporting != self._viewmodel.is_exporting
-        self._previous_is_loading = self._viewmodel.is_loading
-        self._previous_is_exporting = self._viewmodel.is_exporting
+        loading_state_changed = self._previous_is_loading != is_loading
+        exporting_state_changed = self._previous_is_exporting != is_exporting
+        if exporting_state_changed:
+            self._action_bar_stale = True
+        self._previous_is_loading = is_loading
+        self._previous_is_exporting = is_exporting
+        if loading_state_changed and is_loading:
+            # A (re)load publishes lists that may belong to another directory
+            self._reset_row_limits()
+        
+        # Single-file operations publish new file lists without a loading cycle
+        files_changed = (
+            vpk_files is not self._previous_vpk_files
+            or workshop_files is not self._previous_workshop_files
+        )
+        self._previous_vpk_files = vpk_files
+        self._previous_workshop_files = workshop_files
         
         if self._page and self._main_column:
+            # Action bar and checkboxes are patched once by the next flush or rebuild,
+            # however many notifications arrive before it
+            self._selection_dirty = True
+            
             # If loading or exporting state changed, rebuild the content area (index 2)
             # This is needed when switching from/to loading, exporting states
             if loading_state_changed or exporting_state_changed:
-                _safe_print(f"_on_state_changed: loading_state_changed={loading_state_changed}, exporting_state_changed={exporting_state_changed}, rebuilding content area")
-                new_content_area = self._build_content_area()
-                self._main_column.controls[2] = new_content_area
-                self._page.update()
-                _safe_print(f"_on_state_changed: page.update() completed (state changed)")
+                logger.debug("_apply_state_change: loading_state_changed=%s, exporting_state_changed=%s, scheduling content rebuild", loading_state_changed, exporting_state_changed)
+                self._schedule_content_rebuild()
+            elif self._rebuild_pending:
+                # A rebuild is already queued and will reflect this change too
+                logger.debug("_apply_state_change: content rebuild pending, skipping incremental update")
+            elif files_changed and self._expansion_list.page is None:
+                # Section list not on screen (e.g. error view) - rebuild the content area
+                logger.debug("_apply_state_change: files changed, scheduling content rebuild")
+                self._schedule_content_rebuild()
             elif self._action_buttons_row:
                 # Only update action buttons visibility and disabled state when state didn't change
                 # This prevents scrolling to top when checkbox is clicked
-                self._action_buttons_row.visible = self._viewmodel.has_selected_files or self._viewmodel.is_exporting
-                
-                # Update button states and text
-                if self._export_button and self._delete_button and self._selected_count_text:
-                    self._export_button.disabled = not self._viewmodel.has_selected_files
-                    self._delete_button.disabled = not self._viewmodel.has_selected_files
-                    self._selected_count_text.value = f"已选择 {self._viewmodel.selected_count} 项"
-                    _safe_print(f"_on_state_changed: updated button disabled states - has_selected={self._viewmodel.has_selected_files}")
+                if files_changed:
+                    # Patch the sections in place; rows are diffed against the row cache
+                    logger.debug("_apply_state_change: files changed, refreshing sections in place")
+                    self._refresh_expansion_list()
                 
-                _safe_print(f"_on_state_changed: updating action buttons")
-                self._page.update()
-                _safe_print(f"_on_state_changed: page.update() completed")
+                # Only the action bar and the section lists can have changed here
+                logger.debug("_apply_state_change: scheduling action buttons update")
+                if files_changed:
+                    self._schedule_update(self._action_buttons_row, self._expansion_list)
+                else:
+                    self._schedule_update(self._action_buttons_row, self._local_list_view, self._workshop_list_view)
             else:
                 # If action_buttons_row is not yet created (initial load), rebuild content area
-                _safe_print(f"_on_state_changed: action_buttons_row not ready, rebuilding content area")
-                new_content_area = self._build_content_area()
-                self._main_column.controls[2] = new_content_area
-                _safe_print(f"_on_state_changed: calling page.update()")
-                self._page.update()
-                _safe_print(f"_on_state_changed: page.update() completed")
+                logger.debug("_apply_state_change: action_buttons_row not ready, scheduling content rebuild")
+                self._schedule_content_rebuild()
     
     def _on_archive_selected(self, e: "ft.FilePickerResultEvent"):
         """Handle archive file selection from file picker"""
@@ -664,23 +1069,33 @@ class VpkManagerScreen:
             selected_file = e.files[0]
             file_path = selected_file.path
             
-            _safe_print(f"_on_archive_selected: selected file: {file_path}")
+            logger.debug("_on_archive_selected: selected file: %s", file_path)
             
             # Check if directory is selected
             if not self._current_directory:
                 self._viewmodel._error_message = 'Please select a game directory first'
-                print(f"_on_archive_selected: no directory selected")
+                logger.debug("_on_archive_selected: no directory selected")
                 self._on_state_changed()
                 return
             
             # Extract archive (this will trigger load_vpk_files_sync and notify_listeners)
-            print(f"_on_archive_selected: calling extract_archive_sync()")
+            logger.debug("_on_archive_selected: calling extract_archive_sync()")
             success = self._viewmodel.extract_archive_sync(file_path)
-            print(f"_on_archive_selected: extract result: {success}")
-            print(f"_on_archive_selected: waiting for notify_listeners() to trigger _on_state_changed()")
+            logger.debug("_on_archive_selected: extract result: %s", success)
+            logger.debug("_on_archive_selected: waiting for notify_listeners() to trigger _on_state_changed()")
             
             # The notify_listeners() from extract_archive_sync will trigger _on_state_changed()
     
     def dispose(self):
         """Clean up resources"""
+        if self._preload_task is not None:
+            self._preload_task.cancel()
+        if self._export_ticker is not None:
+            self._export_ticker.cancel()
+        # Detach from the shared pickers unless another screen has rebound them
+        if self._folder_picker and self._folder_picker.on_result == self._on_folder_selected:
+            self._folder_picker.on_result = None
+        if self._archive_picker and self._archive_picker.on_result == self._on_archive_selected:
+            self._archive_picker.on_result = None
+        self._folder_picker = self._archive_picker = None
         self._viewmodel.dispose()
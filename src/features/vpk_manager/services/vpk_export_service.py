@@ -1,12 +1,13 @@
 """VPK Export Service - handles exporting VPK files with zstandard compression"""
 
 from pathlib import Path
-from typing import List, Optional, TYPE_CHECKING
-import shutil
+from typing import List, Optional, Tuple, TYPE_CHECKING
 import os
+import stat
 import time
 import tarfile
-import multiprocessing
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import zstandard as zstd
@@ -14,115 +15,225 @@ try:
 except ImportError:
     HAS_ZSTD = False
 
+try:
+    from send2trash import send2trash
+    HAS_SEND2TRASH = True
+except ImportError:
+    HAS_SEND2TRASH = False
+
 if TYPE_CHECKING:
     from features.vpk_manager.viewmodels.vpk_manager_viewmodel import VpkFile
 
+logger = logging.getLogger(__name__)
+
+# Read/copy chunk for streaming files into the archive (tarfile's default is 16 KiB)
+_COPY_BUFSIZE = 1 << 20
+
+# With the 'fast' profile, archives whose thumbnails are below this share of the
+# payload are stored as plain .tar (VPK content barely compresses)
+_STORE_ONLY_MAX_THUMB_SHARE = 0.05
+
+# Expected tar.zst size relative to the input (VPK payloads barely compress); used to preallocate
+_ZSTD_SIZE_ESTIMATE = 0.95
+
+# Characters not allowed in Windows file names -> '_', applied in one str.translate pass
+_INVALID_FILENAME_CHARS = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+# Longest generated archive name (before the extension), well inside Windows path limits
+_MAX_ARCHIVE_NAME = 200
+
+# Concurrent deletions (recycle-bin moves are slow shell calls, not CPU work)
+_DELETE_WORKERS = 8
+
 
 class VpkExportService:
     """Service for exporting and deleting VPK files"""
     
+    # Export compression profile -> zstd level. VPK payloads are mostly
+    # already-compressed assets, so higher levels cost CPU for little gain.
+    COMPRESSION_LEVELS = {'fast': 1, 'balanced': 3, 'archive': 19}
+    DEFAULT_COMPRESSION_PROFILE = 'fast'
+    
     @staticmethod
-    def export_vpk_files_to_7z(vpk_files: List['VpkFile'], output_dir: str) -> tuple[bool, str, float]:
+    def export_vpk_files_to_7z(vpk_files: List['VpkFile'], output_dir: str,
+                               compression_profile: str = DEFAULT_COMPRESSION_PROFILE,
+                               store_only: bool = True) -> tuple[bool, str, float]:
         """
         Export selected VPK files and their thumbnails to a zstandard compressed tar archive.
         
+        With the 'fast' profile and store_only, a selection made up almost entirely of
+        VPK data is written as an uncompressed .tar instead (noted in the message).
+        
         Args:
             vpk_files: List of VpkFile objects to export
             output_dir: Output directory (typically Downloads)
+            compression_profile: Key of COMPRESSION_LEVELS ('fast', 'balanced' or 'archive')
+            store_only: Allow the uncompressed .tar fast path
         
         Returns:
             Tuple of (success: bool, message: str, elapsed_time: float)
         """
         start_time = time.time()
         
-        if not HAS_ZSTD:
-            return False, 'zstandard library not installed. Install with: pip install zstandard', 0.0
-        
         if not vpk_files:
             return False, 'No files selected for export', 0.0
         
+        level = VpkExportService.COMPRESSION_LEVELS.get(compression_profile)
+        if level is None:
+            return False, f'Unknown compression profile: {compression_profile}', 0.0
+        
+        # Archive being written; removed if the export fails part-way
+        partial_path: Optional[Path] = None
         try:
             # Create output directory if it doesn't exist
             output_path = Path(output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
             
+            # Stream each source file straight into the compressor (no temp copy)
+            members = VpkExportService._collect_archive_members(vpk_files)
+            
             # Generate archive name from addontitles
             archive_name = VpkExportService._generate_archive_name(vpk_files)
-            archive_path = output_path / f"{archive_name}.tar.zst"
-            
-            print(f"export_vpk_files_to_7z: creating archive {archive_path}")
             
-            # Create temporary directory for collecting files
-            temp_dir = output_path / '.vpk_temp'
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
-            temp_dir.mkdir(parents=True, exist_ok=True)
-            
-            try:
-                # Copy VPK files and thumbnails to temp directory
-                for vpk_file in vpk_files:
-                    vpk_path = Path(vpk_file.path)
-                    
-                    # Copy VPK file
-                    if vpk_path.exists():
-                        dest = temp_dir / vpk_path.name
-                        print(f"export_vpk_files_to_7z: copying {vpk_path} to {dest}")
-                        shutil.copy2(vpk_path, dest)
-                    
-                    # Copy thumbnail if it exists
-                    if vpk_file.thumbnail_path:
-                        thumb_path = Path(vpk_file.thumbnail_path)
-                        if thumb_path.exists():
-                            dest = temp_dir / thumb_path.name
-                            print(f"export_vpk_files_to_7z: copying thumbnail {thumb_path} to {dest}")
-                            shutil.copy2(thumb_path, dest)
-                
-                # Create tar.zst archive with zstandard compression
-                print(f"export_vpk_files_to_7z: creating zstandard compressed archive with high compression")
-                
-                # Get system CPU count for multi-threaded compression
-                num_threads = max(1, multiprocessing.cpu_count() - 1)  # Leave one core free
-                print(f"export_vpk_files_to_7z: using {num_threads} threads for compression")
-                
-                # Create zstandard context with maximum compression level and multi-threading
-                cctx = zstd.ZstdCompressor(
-                    level=3,  # Maximum compression level (1-22, default 3)
-                    threads=num_threads,  # Multi-threaded compression
-                    write_checksum=True,  # Include checksum for integrity verification
-                )
-                
-                # Create tar archive and compress with zstandard
-                print(f"export_vpk_files_to_7z: compressing files into {archive_path}")
+            if store_only and compression_profile == 'fast' and VpkExportService._is_mostly_vpk_data(vpk_files, members):
+                archive_path = output_path / f"{archive_name}.tar"
+                logger.debug("export_vpk_files_to_7z: storing files uncompressed in %s", archive_path)
                 with open(archive_path, 'wb') as f_out:
-                    with cctx.stream_writer(f_out, closefd=False) as writer:
-                        with tarfile.open(fileobj=writer, mode='w|') as tar:
-                            # Add all files from temp directory to tar
-                            for file_path in sorted(temp_dir.iterdir()):
-                                if file_path.is_file():
-                                    print(f"export_vpk_files_to_7z: adding {file_path.name} to archive")
-                                    tar.add(file_path, arcname=file_path.name)
+                    partial_path = archive_path
+                    VpkExportService._preallocate(f_out, VpkExportService._payload_size(members))
+                    VpkExportService._write_tar(f_out, members)
+                    f_out.truncate()
+                partial_path = None
                 
                 elapsed_time = time.time() - start_time
                 archive_size = archive_path.stat().st_size / (1024 * 1024)  # Size in MB
-                print(f"export_vpk_files_to_7z: successfully created {archive_path} ({archive_size:.2f} MB) in {elapsed_time:.2f} seconds")
-                return True, f"Archive created: {archive_path} ({archive_size:.2f} MB)", elapsed_time
+                logger.debug("export_vpk_files_to_7z: successfully created %s (%.2f MB) in %.2f seconds", archive_path, archive_size, elapsed_time)
+                return True, f"Archive created (uncompressed): {archive_path} ({archive_size:.2f} MB)", elapsed_time
+            
+            if not HAS_ZSTD:
+                return False, 'zstandard library not installed. Install with: pip install zstandard', 0.0
+            
+            archive_path = output_path / f"{archive_name}.tar.zst"
+            logger.debug("export_vpk_files_to_7z: creating archive %s", archive_path)
+            
+            # Create tar.zst archive with zstandard compression
+            logger.debug(
+                "export_vpk_files_to_7z: compressing with profile %r (zstd level %s); expect a ratio near 1.0 for VPK payloads",
+                compression_profile, level,
+            )
+            
+            # Create zstandard context with the profile's level and multi-threading
+            cctx = zstd.ZstdCompressor(
+                level=level,  # 1-22; see COMPRESSION_LEVELS
+                threads=-1,  # Multi-threaded compression, one worker per logical core
+                write_checksum=True,  # Include checksum for integrity verification
+            )
+            
+            # Create tar archive and compress with zstandard
+            logger.debug("export_vpk_files_to_7z: compressing files into %s", archive_path)
+            with open(archive_path, 'wb') as f_out:
+                partial_path = archive_path
+                VpkExportService._preallocate(
+                    f_out, int(VpkExportService._payload_size(members) * _ZSTD_SIZE_ESTIMATE),
+                )
+                with cctx.stream_writer(
+                    f_out,
+                    write_size=zstd.COMPRESSION_RECOMMENDED_OUTPUT_SIZE,
+                    closefd=False,
+                ) as writer:
+                    VpkExportService._write_tar(writer, members)
+                # Drop whatever part of the preallocation the archive did not use
+                f_out.truncate()
+            partial_path = None
             
-            finally:
-                # Clean up temp directory
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir)
-                    print(f"export_vpk_files_to_7z: cleaned up temp directory")
+            elapsed_time = time.time() - start_time
+            archive_size = archive_path.stat().st_size / (1024 * 1024)  # Size in MB
+            logger.debug("export_vpk_files_to_7z: successfully created %s (%.2f MB) in %.2f seconds", archive_path, archive_size, elapsed_time)
+            return True, f"Archive created: {archive_path} ({archive_size:.2f} MB)", elapsed_time
         
         except Exception as e:
             error_msg = f'Error exporting VPK files: {str(e)}'
-            print(f"export_vpk_files_to_7z: {error_msg}")
+            logger.error("export_vpk_files_to_7z: %s", error_msg)
+            if partial_path is not None:
+                # Do not leave a truncated (possibly preallocated, zero-filled) archive behind
+                try:
+                    partial_path.unlink()
+                except OSError:
+                    pass
             elapsed_time = time.time() - start_time
             return False, error_msg, elapsed_time
     
+    @staticmethod
+    def _write_tar(fileobj, members: List[Tuple[Path, str, int]]):
+        """Stream the archive members into fileobj as a tar stream, 1 MiB at a time"""
+        # Per-file logging is decided once, not per member
+        debug = logger.isEnabledFor(logging.DEBUG)
+        with tarfile.open(fileobj=fileobj, mode='w|', copybufsize=_COPY_BUFSIZE) as tar:
+            for src_path, arcname, _ in members:
+                if debug:
+                    logger.debug("export_vpk_files_to_7z: adding %s to archive as %s", src_path, arcname)
+                tarinfo = tar.gettarinfo(src_path, arcname=arcname)
+                with open(src_path, 'rb', buffering=_COPY_BUFSIZE) as f_in:
+                    tar.addfile(tarinfo, fileobj=f_in)
+    
+    @staticmethod
+    def _payload_size(members: List[Tuple[Path, str, int]]) -> int:
+        """Total size in bytes of the archive member files"""
+        return sum(size for _, _, size in members)
+    
+    @staticmethod
+    def _preallocate(f_out, size: int):
+        """Reserve size bytes for the archive up front where the platform supports it (posix_fallocate)"""
+        if size <= 0 or not hasattr(os, 'posix_fallocate'):
+            return
+        try:
+            os.posix_fallocate(f_out.fileno(), 0, size)
+        except OSError as e:
+            # Not supported by the filesystem, or not enough space reserved up front; writing still proceeds
+            logger.debug("_preallocate: skipped (%s)", e)
+    
+    @staticmethod
+    def _is_mostly_vpk_data(vpk_files: List['VpkFile'], members: List[Tuple[Path, str, int]]) -> bool:
+        """Whether thumbnails make up less than _STORE_ONLY_MAX_THUMB_SHARE of the member bytes"""
+        thumb_paths = {Path(vpk_file.thumbnail_path) for vpk_file in vpk_files if vpk_file.thumbnail_path}
+        total = thumb_bytes = 0
+        for src_path, _, size in members:
+            total += size
+            if src_path in thumb_paths:
+                thumb_bytes += size
+        return total > 0 and thumb_bytes < total * _STORE_ONLY_MAX_THUMB_SHARE
+    
+    @staticmethod
+    def _collect_archive_members(vpk_files: List['VpkFile']) -> List[Tuple[Path, str, int]]:
+        """(source path, archive name, size) of every existing VPK and thumbnail; clashing names get an index suffix"""
+        members = []
+        used_names = set()
+        for vpk_file in vpk_files:
+            sources = [Path(vpk_file.path)]
+            if vpk_file.thumbnail_path:
+                sources.append(Path(vpk_file.thumbnail_path))
+            
+            for src_path in sources:
+                # One stat per member: the size is reused for the preallocation and the store-only check
+                try:
+                    st = src_path.stat()
+                except OSError:
+                    continue
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                arcname = src_path.name
+                index = 1
+                while arcname in used_names:
+                    arcname = f"{src_path.stem}_{index}{src_path.suffix}"
+                    index += 1
+                used_names.add(arcname)
+                members.append((src_path, arcname, st.st_size))
+        return members
+    
     @staticmethod
     def delete_vpk_files(vpk_files: List['VpkFile']) -> tuple[bool, str]:
         """
-        Delete VPK files and their thumbnails.
+        Delete VPK files and their thumbnails (to the recycle bin when send2trash is installed).
         
         Args:
             vpk_files: List of VpkFile objects to delete
@@ -133,33 +244,41 @@ class VpkExportService:
         if not vpk_files:
             return False, 'No files selected for deletion'
         
-        try:
-            deleted_count = 0
-            
-            for vpk_file in vpk_files:
-                vpk_path = Path(vpk_file.path)
-                
-                # Delete VPK file
-                if vpk_path.exists():
-                    print(f"delete_vpk_files: deleting {vpk_path}")
-                    vpk_path.unlink()
-                    deleted_count += 1
-                
-                # Delete thumbnail if it exists
-                if vpk_file.thumbnail_path:
-                    thumb_path = Path(vpk_file.thumbnail_path)
-                    if thumb_path.exists():
-                        print(f"delete_vpk_files: deleting thumbnail {thumb_path}")
-                        thumb_path.unlink()
-            
-            message = f'Successfully deleted {deleted_count} file(s)'
-            print(f"delete_vpk_files: {message}")
-            return True, message
+        vpk_paths = [Path(vpk_file.path) for vpk_file in vpk_files]
+        thumb_paths = [Path(vpk_file.thumbnail_path) for vpk_file in vpk_files if vpk_file.thumbnail_path]
         
-        except Exception as e:
-            error_msg = f'Error deleting VPK files: {str(e)}'
-            print(f"delete_vpk_files: {error_msg}")
+        # Every file is attempted; failures are reported together at the end
+        with ThreadPoolExecutor(max_workers=_DELETE_WORKERS) as pool:
+            results = list(pool.map(VpkExportService._delete_file, vpk_paths + thumb_paths))
+        
+        deleted_count = sum(1 for result in results[:len(vpk_paths)] if result is True)
+        failures = [result for result in results if isinstance(result, str)]
+        if failures:
+            error_msg = f'Error deleting VPK files: {"; ".join(failures)}'
+            logger.error("delete_vpk_files: %s", error_msg)
             return False, error_msg
+        
+        if HAS_SEND2TRASH:
+            message = f'Successfully moved {deleted_count} file(s) to the recycle bin'
+        else:
+            message = f'Successfully deleted {deleted_count} file(s)'
+        logger.debug("delete_vpk_files: %s", message)
+        return True, message
+    
+    @staticmethod
+    def _delete_file(path: Path):
+        """Delete one file: True if deleted, False if it did not exist, else an error description"""
+        try:
+            if not path.exists():
+                return False
+            logger.debug("delete_vpk_files: deleting %s", path)
+            if HAS_SEND2TRASH:
+                send2trash(str(path))
+            else:
+                path.unlink()
+            return True
+        except Exception as e:
+            return f'{path.name}: {e}'
     
     @staticmethod
     def _generate_archive_name(vpk_files: List['VpkFile']) -> str:
@@ -180,12 +299,10 @@ class VpkExportService:
             if len(filenames) > 3:
                 archive_name += f"-and-{len(filenames) - 3}-more"
         
-        # Sanitize filename (remove invalid characters)
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            archive_name = archive_name.replace(char, '_')
+        # Sanitize filename (replace invalid characters) and cap its length
+        archive_name = archive_name.translate(_INVALID_FILENAME_CHARS)[:_MAX_ARCHIVE_NAME]
         
-        print(f"_generate_archive_name: generated archive name: {archive_name}")
+        logger.debug("_generate_archive_name: generated archive name: %s", archive_name)
         return archive_name
     
     @staticmethod
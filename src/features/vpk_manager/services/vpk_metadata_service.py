@@ -1,18 +1,107 @@
 """VPK metadata extraction and caching service"""
 
 import json
+import logging
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import vpk
 
+try:
+    from charset_normalizer import from_bytes
+    HAS_CHARSET_NORMALIZER = True
+except ImportError:
+    HAS_CHARSET_NORMALIZER = False
 
-def _safe_print(msg: str):
-    """Safe print that handles encoding errors"""
+
+logger = logging.getLogger(__name__)
+
+# Threads reading VPK metadata in bulk (I/O bound, so more than the core count)
+_BULK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Single metadata store inside the config directory (replaces one JSON file per VPK)
+_DB_NAME = 'metadata.sqlite'
+
+# PRAGMA user_version: 1 once the legacy per-VPK JSON files were imported (rows keyed by
+# filename stem), 2 once rows are keyed by path relative to addons
+_SCHEMA_VERSION = 2
+
+# Bound parameters per "IN (...)" query (SQLite's historical default limit is 999)
+_QUERY_CHUNK = 900
+
+# addontitle "value" line of addoninfo.txt, matched on the raw bytes
+_ADDONTITLE_RE = re.compile(rb'(?im)^[ \t]*addontitle[ \t]+"([^"\r\n]*)"')
+
+# VPK directory format: header (signature, version, tree size[, 4 v2 section sizes])
+_VPK_SIGNATURE = 0x55aa1234
+_VPK_HEADER = struct.Struct('<3I')
+_VPK_HEADER_SIZES = {1: 12, 2: 28}
+# Tree entry after each filename: crc, preload size, archive index, offset, length, terminator
+_VPK_ENTRY = struct.Struct('<IHHIIH')
+# Archive index of entries stored in the directory file itself
+_VPK_EMBEDDED = 0x7fff
+
+
+def _read_vpk_addoninfo(vpk_file_path: str) -> Optional[bytes]:
+    """
+    Read addoninfo.txt straight from a single-file VPK's directory tree.
+    
+    Returns None if the VPK has no root addoninfo.txt; raises ValueError for
+    layouts this reader does not handle (callers fall back to the vpk library).
+    """
+    with open(vpk_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        signature, version, tree_size = _VPK_HEADER.unpack_from(mm, 0)
+        header_size = _VPK_HEADER_SIZES.get(version)
+        if signature != _VPK_SIGNATURE or header_size is None:
+            raise ValueError(f'unsupported VPK header (version {version})')
+        tree_end = header_size + tree_size
+        
+        def read_string(pos: int):
+            end = mm.find(b'\0', pos, tree_end)
+            if end < 0:
+                raise ValueError('truncated VPK directory tree')
+            return mm[pos:end], end + 1
+        
+        # extension -> path -> filename levels, each terminated by an empty string
+        pos = header_size
+        while True:
+            extension, pos = read_string(pos)
+            if not extension:
+                return None
+            while True:
+                path, pos = read_string(pos)
+                if not path:
+                    break
+                while True:
+                    filename, pos = read_string(pos)
+                    if not filename:
+                        break
+                    _, preload_size, archive_index, offset, length, _ = _VPK_ENTRY.unpack_from(mm, pos)
+                    pos += _VPK_ENTRY.size
+                    if extension == b'txt' and path == b' ' and filename == b'addoninfo':
+                        preload = mm[pos:pos + preload_size]
+                        if not length:
+                            return preload
+                        if archive_index != _VPK_EMBEDDED:
+                            raise ValueError('addoninfo.txt is stored in a separate archive file')
+                        start = tree_end + offset
+                        return preload + mm[start:start + length]
+                    pos += preload_size
+
+
+def _stat_stamp(vpk_file_path: str) -> Tuple[Optional[float], Optional[int]]:
+    """(mtime, size) of a VPK file, or (None, None) if it cannot be stat'ed"""
     try:
-        print(msg)
-    except UnicodeEncodeError:
-        # If encoding fails, replace problematic characters
-        print(msg.encode('utf-8', errors='replace').decode('utf-8', errors='replace'))
+        stat = os.stat(vpk_file_path)
+    except OSError:
+        return None, None
+    return stat.st_mtime, stat.st_size
 
 
 class VpkMetadataService:
@@ -22,91 +111,196 @@ class VpkMetadataService:
         """Initialize metadata service with config directory"""
         self.config_dir = Path(config_dir)
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        # Rows are keyed by path relative to the addons directory next to the config directory
+        self._addons_dir = self.config_dir.parent / 'addons'
+        self._addons_prefix = str(self._addons_dir) + os.sep
+        
+        # One connection shared by the scan and bulk worker threads, serialized by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.config_dir / _DB_NAME, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS addon_meta('
+            'key TEXT PRIMARY KEY, addontitle TEXT, mtime REAL, size INTEGER)'
+        )
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < _SCHEMA_VERSION:
+            self._migrate(version)
     
-    def get_json_path(self, vpk_file_path: str) -> Path:
-        """Get the JSON file path for a VPK file"""
-        vpk_name = Path(vpk_file_path).stem  # Get filename without extension
-        return self.config_dir / f"{vpk_name}.json"
+    def _key(self, vpk_file_path: str) -> str:
+        """Row key of a VPK file: its path relative to addons, '/'-separated, without .disabled"""
+        # Disabling a VPK keeps its key, and addons/123.vpk and addons/workshop/123.vpk differ
+        path = vpk_file_path.removesuffix('.disabled')
+        if path.startswith(self._addons_prefix):
+            path = path[len(self._addons_prefix):]
+        else:
+            # Not under addons (scans always are); the absolute path still identifies it
+            path = os.path.abspath(path)
+        return path.replace(os.sep, '/')
     
-    def load_metadata(self, vpk_file_path: str) -> Optional[Dict[str, Any]]:
-        """Load metadata from JSON file if it exists"""
-        json_path = self.get_json_path(vpk_file_path)
-        if json_path.exists():
+    def _migrate(self, version: int):
+        """One-time migration of the rows keyed by filename stem to keys relative to addons"""
+        if version < 1:
+            rows = self._read_json_files()
+        else:
+            rows = self._conn.execute('SELECT stem, addontitle, mtime, size FROM meta').fetchall()
+        
+        migrated = []
+        for stem, addontitle, mtime, size in rows:
+            # The stem of foo.vpk is foo, that of foo.vpk.disabled is foo.vpk
+            name = stem.removesuffix('.vpk') + '.vpk'
+            candidates = []
+            for key in (name, f'workshop/{name}'):
+                for path in (self._addons_dir / key, self._addons_dir / f'{key}.disabled'):
+                    stamp = _stat_stamp(str(path))
+                    if stamp[0] is not None:
+                        candidates.append((key, stamp))
+                        break
+            if mtime is None:
+                # Unstamped rows are trusted on use, so an ambiguous stem is dropped
+                keys = [key for key, _ in candidates] if len(candidates) == 1 else []
+            else:
+                keys = [key for key, stamp in candidates if stamp == (mtime, size)]
+            migrated.extend((key, addontitle, mtime, size) for key in keys)
+        
+        with self._conn:
+            self._conn.executemany('INSERT OR IGNORE INTO addon_meta VALUES (?, ?, ?, ?)', migrated)
+            self._conn.execute('DROP TABLE IF EXISTS meta')
+            self._conn.execute(f'PRAGMA user_version={_SCHEMA_VERSION}')
+        logger.debug("_migrate: migrated %s of %s metadata rows", len(migrated), len(rows))
+    
+    def _read_json_files(self) -> List[tuple]:
+        """(stem, addontitle, None, None) rows of the legacy per-VPK JSON cache files"""
+        rows = []
+        for json_path in self.config_dir.glob('*.json'):
             try:
                 with open(json_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    metadata = json.load(f)
             except Exception as e:
-                _safe_print(f"load_metadata: failed to load JSON {json_path}: {e}")
-        return None
+                logger.error("_read_json_files: failed to load JSON %s: %s", json_path, e)
+                continue
+            if isinstance(metadata, dict):
+                rows.append((json_path.stem, metadata.get('addontitle'), None, None))
+        return rows
+    
+    def close(self):
+        """Close the metadata database"""
+        with self._lock:
+            self._conn.close()
+    
+    def load_metadata(self, vpk_file_path: str) -> Optional[Dict[str, Any]]:
+        """Load cached metadata if it was saved for the VPK's current mtime and size"""
+        key = self._key(vpk_file_path)
+        row = self.get_many([key]).get(key)
+        if row is None:
+            return None
+        stamp = _stat_stamp(vpk_file_path)
+        if not self._is_fresh(row, stamp):
+            logger.debug("load_metadata: %s changed since its metadata was cached", vpk_file_path)
+            return None
+        if row[1] is None:
+            self._save_rows([(key, row[0], *stamp)])
+        return {'addontitle': row[0]} if row[0] else {}
+    
+    @staticmethod
+    def _is_fresh(row: tuple, stamp: Tuple[Optional[float], Optional[int]]) -> bool:
+        """Whether a cached (addontitle, mtime, size) row still describes the file"""
+        # Rows imported from the JSON cache carry no stamp; they are trusted and stamped on first use
+        return row[1] is None or (row[1], row[2]) == stamp
+    
+    def get_many(self, keys: List[str]) -> Dict[str, tuple]:
+        """Cached (addontitle, mtime, size) per key for every key present in the database"""
+        found: Dict[str, tuple] = {}
+        try:
+            with self._lock:
+                for i in range(0, len(keys), _QUERY_CHUNK):
+                    chunk = keys[i:i + _QUERY_CHUNK]
+                    for key, *row in self._conn.execute(
+                        f'SELECT key, addontitle, mtime, size FROM addon_meta WHERE key IN ({",".join("?" * len(chunk))})',
+                        chunk,
+                    ):
+                        found[key] = tuple(row)
+        except sqlite3.Error as e:
+            logger.error("get_many: failed to query metadata: %s", e)
+        return found
     
     def save_metadata(self, vpk_file_path: str, metadata: Optional[Dict[str, Any]]) -> bool:
-        """Save metadata to JSON file"""
-        json_path = self.get_json_path(vpk_file_path)
+        """Save metadata to the database, stamped with the VPK's current mtime and size"""
+        addontitle = (metadata or {}).get('addontitle')
+        return self._save_rows([(self._key(vpk_file_path), addontitle, *_stat_stamp(vpk_file_path))])
+    
+    def _save_rows(self, rows: List[tuple]) -> bool:
+        """Insert or replace metadata rows in a single transaction"""
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata or {}, f, ensure_ascii=False, indent=2)
-            _safe_print(f"save_metadata: saved metadata to {json_path}")
+            with self._lock, self._conn:
+                self._conn.executemany('INSERT OR REPLACE INTO addon_meta VALUES (?, ?, ?, ?)', rows)
+            logger.debug("_save_rows: saved metadata for %s VPK files", len(rows))
             return True
-        except Exception as e:
-            _safe_print(f"save_metadata: failed to save JSON {json_path}: {e}")
+        except sqlite3.Error as e:
+            logger.error("_save_rows: failed to save metadata: %s", e)
             return False
     
     def extract_addontitle(self, vpk_file_path: str) -> Optional[str]:
         """Extract addontitle from VPK file"""
+        # Fast path: locate addoninfo.txt without building the whole file index
+        try:
+            addoninfo_raw = _read_vpk_addoninfo(vpk_file_path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.debug("extract_addontitle: direct read failed for %s (%s); using vpk library", vpk_file_path, e)
+        else:
+            if addoninfo_raw is None:
+                logger.debug("extract_addontitle: addoninfo.txt not found in %s", vpk_file_path)
+                return None
+            return self._parse_addontitle(addoninfo_raw)
+        
         try:
             # Try to open VPK file
             vpk_file = vpk.VPK(vpk_file_path)
             
             # Look for addoninfo.txt in the VPK
             if 'addoninfo.txt' in vpk_file:
-                # Try multiple encodings to handle various character sets
-                addoninfo_data = None
-                for encoding in ['utf-8', 'utf-16', 'gbk', 'latin-1']:
-                    try:
-                        addoninfo_data = vpk_file['addoninfo.txt'].read().decode(encoding)
-                        break
-                    except (UnicodeDecodeError, LookupError):
-                        continue
-                
-                # If all encodings fail, use utf-8 with error handling
-                if addoninfo_data is None:
-                    addoninfo_data = vpk_file['addoninfo.txt'].read().decode('utf-8', errors='replace')
-                
-                addontitle = self._parse_addontitle(addoninfo_data)
-                return addontitle
+                return self._parse_addontitle(vpk_file['addoninfo.txt'].read())
             else:
-                _safe_print(f"extract_addontitle: addoninfo.txt not found in {vpk_file_path}")
+                logger.debug("extract_addontitle: addoninfo.txt not found in %s", vpk_file_path)
                 return None
         except Exception as e:
-            _safe_print(f"extract_addontitle: failed to extract from {vpk_file_path}: {e}")
+            logger.error("extract_addontitle: failed to extract from %s: %s", vpk_file_path, e)
             return None
     
-    def _parse_addontitle(self, addoninfo_content: str) -> Optional[str]:
-        """Parse addontitle from addoninfo.txt content"""
-        try:
-            for line in addoninfo_content.split('\n'):
-                line = line.strip()
-                if line.startswith('addontitle'):
-                    # Extract value between quotes
-                    # Format: addontitle "value"
-                    parts = line.split('"')
-                    if len(parts) >= 2:
-                        return parts[1]
-            return None
-        except Exception as e:
-            _safe_print(f"_parse_addontitle: failed to parse addoninfo content: {e}")
+    def _parse_addontitle(self, addoninfo_raw: bytes) -> Optional[str]:
+        """Parse addontitle from the raw bytes of addoninfo.txt (only the title is decoded)"""
+        if addoninfo_raw.startswith((b'\xff\xfe', b'\xfe\xff')):
+            # UTF-16 with BOM: re-encode so the byte pattern applies
+            addoninfo_raw = addoninfo_raw.decode('utf-16', errors='replace').encode('utf-8')
+        match = _ADDONTITLE_RE.search(addoninfo_raw)
+        if match is None:
             return None
+        
+        title = match.group(1)
+        # Strict decodes of the title bytes only; GBK covers most non-UTF-8 add-ons
+        for encoding in ('utf-8', 'gbk'):
+            try:
+                return title.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        # Detection is unreliable on a few bytes, so it is the last resort before latin-1
+        if HAS_CHARSET_NORMALIZER:
+            best = from_bytes(title).best()
+            if best is not None:
+                return str(best)
+        return title.decode('latin-1')
     
     def get_or_extract_metadata(self, vpk_file_path: str) -> Optional[Dict[str, Any]]:
         """Get metadata from cache or extract from VPK"""
-        # First, try to load from JSON cache
+        # First, try to load from the database
         cached_metadata = self.load_metadata(vpk_file_path)
         if cached_metadata is not None:
-            _safe_print(f"get_or_extract_metadata: using cached metadata for {vpk_file_path}")
-            return cached_metadata
+            logger.debug("get_or_extract_metadata: using cached metadata for %s", vpk_file_path)
+            return cached_metadata or None
         
         # If not cached, extract from VPK
-        _safe_print(f"get_or_extract_metadata: extracting metadata from {vpk_file_path}")
+        logger.debug("get_or_extract_metadata: extracting metadata from %s", vpk_file_path)
         addontitle = self.extract_addontitle(vpk_file_path)
         
         # Create metadata dict (even if empty for error cases)
@@ -125,3 +319,52 @@ class VpkMetadataService:
         if metadata and 'addontitle' in metadata:
             return metadata['addontitle']
         return None
+    
+    def get_cached_addontitles(
+        self,
+        vpk_file_paths: List[str],
+        stamps: Optional[Dict[str, Tuple[float, int]]] = None,
+    ) -> Dict[str, Optional[str]]:
+        """
+        addontitle per path for the VPKs cached for their current mtime and size (no VPK is opened).
+        
+        Args:
+            vpk_file_paths: VPK files to look up
+            stamps: Optional (mtime, size) per path already stat'ed by the caller; other paths are stat'ed here
+        """
+        keys = {path: self._key(path) for path in vpk_file_paths}
+        rows = self.get_many(list(set(keys.values())))
+        titles: Dict[str, Optional[str]] = {}
+        updates = []
+        for path, key in keys.items():
+            row = rows.get(key)
+            if row is None:
+                continue
+            stamp = (stamps or {}).get(path) or _stat_stamp(path)
+            if self._is_fresh(row, stamp):
+                titles[path] = row[0] or None
+                if row[1] is None:
+                    updates.append((key, row[0], *stamp))
+        if updates:
+            self._save_rows(updates)
+        return titles
+    
+    def get_addontitles_bulk(self, vpk_file_paths: List[str]) -> List[Optional[str]]:
+        """get_addontitle for many VPK files: one cache query, parallel extraction, one write (input order)"""
+        titles = self.get_cached_addontitles(vpk_file_paths)
+        missing = [path for path in dict.fromkeys(vpk_file_paths) if path not in titles]
+        
+        if missing:
+            stamps = [_stat_stamp(path) for path in missing]
+            if len(missing) < 2:
+                extracted = [self.extract_addontitle(path) for path in missing]
+            else:
+                with ThreadPoolExecutor(max_workers=min(_BULK_WORKERS, len(missing))) as pool:
+                    extracted = list(pool.map(self.extract_addontitle, missing))
+            self._save_rows([
+                (self._key(path), title, *stamp)
+                for path, title, stamp in zip(missing, extracted, stamps)
+            ])
+            titles.update(zip(missing, extracted))
+        
+        return [titles[path] or None for path in vpk_file_paths]
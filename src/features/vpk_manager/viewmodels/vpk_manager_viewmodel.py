@@ -1,13 +1,25 @@
 """VPK Manager ViewModel"""
 
-from dataclasses import dataclass
+import asyncio
+import fnmatch
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field, replace
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import zipfile
 import shutil
 import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from core.viewmodels.base_viewmodel import BaseViewModel
-from core.services.storage_service import StorageService
+from core.services import storage
 from features.vpk_manager.services.vpk_metadata_service import VpkMetadataService
 
 try:
@@ -22,27 +34,176 @@ try:
 except ImportError:
     HAS_ZSTD = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+# Bytes -> MB factor, applied by multiplication
+_INV_MB = 1.0 / (1024 * 1024)
+
+# Threads extracting ZIP members in parallel
+_EXTRACT_WORKERS = os.cpu_count() or 1
+
+# Read/copy chunk when extracting tar archives (tarfile's defaults are 10-16 KiB)
+_COPY_BUFSIZE = 1 << 20
+
+# Leading bytes of the supported archive formats; tar's "ustar" magic sits at offset 257
+_ARCHIVE_MAGIC = (
+    (b'PK\x03\x04', 'zip'),
+    (b'PK\x05\x06', 'zip'),  # Empty ZIP
+    (b'7z\xbc\xaf\x27\x1c', '7z'),
+    (b'\x28\xb5\x2f\xfd', 'tar.zst'),
+)
+_ARCHIVE_HEAD_SIZE = 262
+
+# Largest zstd window accepted on import, so archives made with long-distance matching
+# (zstd --long=31) decode; zstandard's default limit is 128 MiB
+_ZSTD_MAX_WINDOW_SIZE = 1 << 31
+
+# Uncompressed ZIP members at least this large are copied in the kernel with os.sendfile (POSIX)
+_SENDFILE_MIN_SIZE = 1 << 20
+_HAS_SENDFILE = hasattr(os, 'sendfile')
+
+# addontitles read per batch by the background enrichment (one notification per batch)
+_TITLE_BATCH = 20
+
+# Last scan result, shown at startup while the saved directory is rescanned (in .vpk_config)
+_LISTING_SNAPSHOT_NAME = 'listing_cache.json'
+
 
-def _safe_print(msg: str):
-    """Safe print that handles encoding errors"""
+def _name_matcher(pattern: str) -> Callable[[str], bool]:
+    """Precompiled fnmatch for a file-name pattern (same platform case rules, no per-name pattern lookup)"""
+    match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    if os.path.normcase('A') == 'A':
+        return lambda name: match(name) is not None
+    return lambda name: match(os.path.normcase(name)) is not None
+
+
+# Local add-ons (.vpk and .vpk.disabled) and workshop add-ons
+_LOCAL_VPK_NAME = _name_matcher('*.vpk*')
+_WORKSHOP_VPK_NAME = _name_matcher('*.vpk')
+
+
+def _scan_addons(directory: Path, is_vpk_name: Callable[[str], bool]) -> Tuple[List[os.DirEntry], Dict[str, str]]:
+    """Single directory scan: files passing is_vpk_name (sorted by name) and lower-cased .jpg name -> on-disk name"""
+    matches = []
+    thumbnails = {}
     try:
-        print(msg)
-    except UnicodeEncodeError:
-        # If encoding fails, replace problematic characters
-        print(msg.encode('utf-8', errors='replace').decode('utf-8', errors='replace'))
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                lower = name.lower()
+                if lower.endswith('.jpg'):
+                    thumbnails[lower] = name
+                # Matching follows the platform's case rules, like Path.glob; '*' skips dotfiles there too
+                elif not name.startswith('.') and is_vpk_name(name) and entry.is_file():
+                    matches.append(entry)
+    except OSError as e:
+        logger.error("_scan_addons: failed to scan %s: %s", directory, e)
+    matches.sort(key=attrgetter('name'))
+    return matches, thumbnails
+
+
+def _zip_member_path(filename: str) -> str:
+    """Path relative to addons that ZipFile.extract writes a member to ('/'-separated, '' for none)"""
+    # ZipFile's rules: the drive and empty, '.' and '..' components are dropped, so
+    # '../../x.vpk' lands in addons and '/workshop/x.vpk' in addons/workshop
+    name = filename.replace('/', os.sep)
+    if os.altsep:
+        name = name.replace(os.altsep, os.sep)
+    name = os.path.splitdrive(name)[1]
+    return '/'.join(part for part in name.split(os.sep) if part not in ('', os.curdir, os.pardir))
+
+
+def _member_path(name: str) -> str:
+    """Path relative to addons that tarfile/py7zr write a member to ('/'-separated; may lie outside addons)"""
+    # Names are joined to addons as they are, so only '.' components and 'x/..' pairs go
+    return os.path.normpath(name).replace(os.sep, '/')
+
+
+def _touches_workshop(names: List[str]) -> bool:
+    """Whether any extracted path (relative to addons, see the extractors) lies in the workshop directory"""
+    for name in names:
+        parts = name.split('/', 1)
+        if len(parts) == 2 and parts[0].lower() == 'workshop':
+            return True
+    return False
 
 
-@dataclass
+def _archive_kind(archive_path: str) -> Optional[str]:
+    """'zip', '7z', 'tar.zst' or 'tar' from the file's leading bytes, else from its name (None if unsupported)"""
+    with open(archive_path, 'rb') as f:
+        head = f.read(_ARCHIVE_HEAD_SIZE)
+    for magic, kind in _ARCHIVE_MAGIC:
+        if head.startswith(magic):
+            return kind
+    if head[257:262] == b'ustar':
+        return 'tar'
+    
+    # Old-style tar headers carry no magic
+    lower = archive_path.lower()
+    for suffixes, kind in (
+        (('.zip',), 'zip'),
+        (('.7z',), '7z'),
+        (('.tar.zst', '.tar.zstd'), 'tar.zst'),
+        (('.tar',), 'tar'),
+    ):
+        if lower.endswith(suffixes):
+            return kind
+    return None
+
+
+@dataclass(slots=True, frozen=True)
 class VpkFile:
-    """VPK file data model"""
+    """VPK file data model (immutable; use dataclasses.replace to derive a changed copy)"""
     name: str
     path: str
     size: int
-    modified_time: str
+    modified_time: float  # st_mtime; format at the view layer if it is ever shown
     is_valid: bool = True
     thumbnail_path: Optional[str] = None  # Path to thumbnail image (.jpg)
     is_disabled: bool = False  # Whether the VPK is disabled (.vpk.disabled)
     addontitle: Optional[str] = None  # Add-on title extracted from addoninfo.txt
+    # Display strings, derived once per file in __post_init__
+    size_mb_str: str = field(init=False, repr=False, compare=False)  # File size in MB
+    display_title: str = field(init=False, repr=False, compare=False)  # Name, then addontitle if known
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'size_mb_str', '%.2f' % (self.size * _INV_MB))
+        object.__setattr__(
+            self, 'display_title',
+            f"{self.name} - {self.addontitle}" if self.addontitle else self.name,
+        )
+
+
+def _vpk_file_to_snapshot(vpk: VpkFile) -> dict:
+    """JSON-ready entry of the listing snapshot"""
+    return {
+        'name': vpk.name,
+        'path': vpk.path,
+        'size': vpk.size,
+        'mtime': vpk.modified_time,
+        'thumbnail': vpk.thumbnail_path,
+        'disabled': vpk.is_disabled,
+        'title': vpk.addontitle,
+    }
+
+
+def _vpk_file_from_snapshot(entry: dict) -> VpkFile:
+    """VpkFile from a listing snapshot entry"""
+    return VpkFile(
+        name=entry['name'],
+        path=entry['path'],
+        size=entry['size'],
+        modified_time=entry['mtime'],
+        thumbnail_path=entry.get('thumbnail') or '',
+        is_disabled=entry.get('disabled', False),
+        addontitle=entry.get('title'),
+    )
 
 
 class VpkManagerViewModel(BaseViewModel):
@@ -50,24 +211,57 @@ class VpkManagerViewModel(BaseViewModel):
     
     STORAGE_KEY_DIRECTORY = 'vpk_manager_directory'
     
+    # Kind passed to notify_listeners() when only the selection changed
+    CHANGE_SELECTION = 'selection'
+    
     def __init__(self):
         super().__init__()
-        self._storage = StorageService()
+        self._storage = storage
         self._metadata_service: Optional[VpkMetadataService] = None
+        # Guards swapping the metadata service; the local and workshop scans run concurrently
+        self._metadata_lock = threading.Lock()
+        # (path, size, mtime_ns) -> addontitle; rescans skip the metadata JSON for unchanged files
+        self._addontitle_cache: Dict[Tuple[str, int, int], Optional[str]] = {}
+        # Scanned directory -> (its st_mtime_ns, files); reused while the directory is unchanged
+        self._listing_cache: Dict[str, Tuple[int, List[VpkFile]]] = {}
+        # (path, size, mtime_ns) of scanned VPKs whose addontitle is not cached yet; scans list
+        # them without a title and a background thread reads the titles afterwards
+        self._pending_titles: List[Tuple[str, int, int]] = []
+        self._titles_lock = threading.Lock()
+        self._title_thread: Optional[threading.Thread] = None
+        # Set while the metadata service is being swapped: the thread stops after its batch in flight
+        self._title_stop = threading.Event()
+        # Guards swapping the file lists and the listing cache: scans, file operations and the
+        # title thread each read the current list and publish a new one
+        self._files_lock = threading.Lock()
+        # Serializes snapshot writes (the scan and the title thread share the temp file)
+        self._snapshot_lock = threading.Lock()
         
         # State
-        self._directory_path: str = self._storage.get(self.STORAGE_KEY_DIRECTORY, '')
+        self._directory_path: str = ''
+        # left4dead2\\addons and its workshop directory under _directory_path, built once per directory
+        self._addons_path: Optional[Path] = None
+        self._workshop_path: Optional[Path] = None
+        self._set_directory_path(self._storage.get(self.STORAGE_KEY_DIRECTORY, ''))
         self._vpk_files: List[VpkFile] = []
         self._workshop_files: List[VpkFile] = []
+        # Lists restored from the previous session's snapshot, not yet confirmed by a scan
+        self._listing_restored = self._load_listing_snapshot()
         self._is_loading = False
         self._is_exporting = False  # Track export state
         self._export_elapsed_time: float = 0.0  # Track export elapsed time in seconds
+        self._export_started: Optional[float] = None  # time.monotonic() while an export/delete runs
         self._error_message: str = ''
         self._selected_file: Optional[VpkFile] = None
+        # Load started by set_directory_sync on a running loop (referenced so it is not collected)
+        self._directory_task: Optional[asyncio.Task] = None
         
         # Selection state - track which files are selected
         self._selected_vpk_files: set = set()  # Store file paths of selected local VPK files
         self._selected_workshop_files: set = set()  # Store file paths of selected workshop files
+        # 'local'/'workshop' -> (indexed list, path -> (position, file)); file lists are replaced,
+        # never mutated, so an index stays valid for as long as its list is the published one
+        self._path_indexes: Dict[str, Tuple[List[VpkFile], Dict[str, Tuple[int, VpkFile]]]] = {}
     
     # Getters
     @property
@@ -86,6 +280,11 @@ class VpkManagerViewModel(BaseViewModel):
     def is_loading(self) -> bool:
         return self._is_loading
     
+    @property
+    def has_restored_listing(self) -> bool:
+        """Whether the file lists come from the previous session and await a rescan"""
+        return self._listing_restored
+    
     @property
     def is_exporting(self) -> bool:
         """Check if export is in progress"""
@@ -93,13 +292,15 @@ class VpkManagerViewModel(BaseViewModel):
     
     @property
     def export_elapsed_time(self) -> float:
-        """Get export elapsed time in seconds"""
+        """Get export elapsed time in seconds (live while the operation runs)"""
+        if self._export_started is not None:
+            return time.monotonic() - self._export_started
         return self._export_elapsed_time
     
     @property
     def export_elapsed_time_display(self) -> str:
         """Get formatted export elapsed time for display"""
-        elapsed = self._export_elapsed_time
+        elapsed = self.export_elapsed_time
         if elapsed < 60:
             return f"{elapsed:.1f}s"
         else:
@@ -141,33 +342,137 @@ class VpkManagerViewModel(BaseViewModel):
     
     # Business logic methods
     def set_directory_sync(self, directory: str):
-        """Set the working directory and load VPK files (synchronous)"""
-        self._directory_path = directory
-        self._storage.set(self.STORAGE_KEY_DIRECTORY, directory)
-        _safe_print(f"set_directory_sync: saved directory to storage: {directory}")
-        self.notify_listeners()
-        self.load_vpk_files_sync(directory)
+        """Set the working directory and load VPK files (scheduled on the running loop, else run to completion)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.set_directory(directory))
+        else:
+            self._directory_task = loop.create_task(self.set_directory(directory))
     
-    def load_vpk_files_sync(self, directory: str):
-        """Load VPK files from directory (synchronous)"""
-        self._set_loading(True)
+    def load_vpk_files_sync(self, directory: str, show_loading: bool = True):
+        """
+        Load VPK files from directory (synchronous)
+        
+        Args:
+            directory: Game directory to scan
+            show_loading: False refreshes the shown lists in place (no loading state);
+                selections of files that still exist are kept
+        """
+        if show_loading:
+            self._set_loading(True)
         try:
-            self._vpk_files = self._get_vpk_files(directory)
-            self._workshop_files = self._get_workshop_files(directory)
+            vpk_files, workshop_files = self._scan_directory(directory)
+            with self._files_lock:
+                self._vpk_files, self._workshop_files = vpk_files, workshop_files
             self._error_message = ''
-            # Clear selections when loading new directory
-            self._selected_vpk_files.clear()
-            self._selected_workshop_files.clear()
+            if show_loading:
+                # Clear selections when loading new directory
+                self._selected_vpk_files.clear()
+                self._selected_workshop_files.clear()
+            else:
+                self._selected_vpk_files.intersection_update(vpk.path for vpk in self._vpk_files)
+                self._selected_workshop_files.intersection_update(vpk.path for vpk in self._workshop_files)
+            self._listing_restored = False
+            if directory == self._directory_path:
+                self._save_listing_snapshot()
+            self._start_title_enrichment()
         except Exception as e:
             self._error_message = str(e)
         finally:
-            self._set_loading(False)
+            if show_loading:
+                self._set_loading(False)
+            else:
+                self.notify_listeners()
+    
+    async def load_vpk_files(self, directory: str, show_loading: bool = True):
+        """Load VPK files from directory in a worker thread (non-blocking)"""
+        await asyncio.to_thread(self.load_vpk_files_sync, directory, show_loading)
+    
+    def _listing_snapshot_path(self) -> Optional[Path]:
+        """Snapshot file of the current directory's listing (None without a directory)"""
+        if not self._directory_path:
+            return None
+        return self._addons_path.parent / '.vpk_config' / _LISTING_SNAPSHOT_NAME
+    
+    def _load_listing_snapshot(self) -> bool:
+        """Restore the file lists saved by the previous session. Returns True if any were restored"""
+        snapshot_path = self._listing_snapshot_path()
+        if snapshot_path is None:
+            return False
+        try:
+            raw = snapshot_path.read_bytes()
+            data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+            if data.get('directory') != self._directory_path:
+                return False
+            vpk_files = [_vpk_file_from_snapshot(entry) for entry in data.get('local', ())]
+            workshop_files = [_vpk_file_from_snapshot(entry) for entry in data.get('workshop', ())]
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            # orjson.JSONDecodeError is a ValueError
+            logger.warning("_load_listing_snapshot: ignoring %s: %s", snapshot_path, e)
+            return False
+        
+        self._vpk_files = vpk_files
+        self._workshop_files = workshop_files
+        logger.debug("_load_listing_snapshot: restored %s local, %s workshop files", len(vpk_files), len(workshop_files))
+        return bool(vpk_files or workshop_files)
+    
+    def _save_listing_snapshot(self):
+        """Write the current file lists for the next session's startup (atomically via temp file + rename)"""
+        snapshot_path = self._listing_snapshot_path()
+        # The config directory exists once a scan created the metadata service; never create it here
+        if snapshot_path is None or not snapshot_path.parent.is_dir():
+            return
+        tmp_path = snapshot_path.with_suffix('.json.tmp')
+        with self._snapshot_lock:
+            # Lists read inside the lock, so the last write carries the latest ones
+            data = {
+                'directory': self._directory_path,
+                'local': [_vpk_file_to_snapshot(vpk) for vpk in self._vpk_files],
+                'workshop': [_vpk_file_to_snapshot(vpk) for vpk in self._workshop_files],
+            }
+            try:
+                if HAS_ORJSON:
+                    raw = orjson.dumps(data)
+                else:
+                    raw = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                tmp_path.write_bytes(raw)
+                os.replace(tmp_path, snapshot_path)
+            except OSError as e:
+                logger.error("_save_listing_snapshot: failed to write %s: %s", snapshot_path, e)
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
     
     async def set_directory(self, directory: str):
         """Set the working directory and load VPK files"""
-        self._directory_path = directory
+        self._set_directory_path(directory)
+        self._storage.set(self.STORAGE_KEY_DIRECTORY, directory)
+        logger.debug("set_directory: saved directory to storage: %s", directory)
         self.notify_listeners()
-        self.load_vpk_files_sync(directory)
+        # Scan in a worker thread so the event loop keeps painting the loading state
+        await self.load_vpk_files(directory)
+    
+    def _set_directory_path(self, directory: str):
+        """Set the working directory and the addons/workshop paths derived from it"""
+        self._directory_path = directory
+        self._addons_path = Path(directory) / 'left4dead2' / 'addons'
+        self._workshop_path = self._addons_path / 'workshop'
+    
+    def _addons_path_of(self, directory: str) -> Path:
+        """left4dead2\\addons under directory (the memoized path for the current directory)"""
+        if directory == self._directory_path and self._addons_path is not None:
+            return self._addons_path
+        return Path(directory) / 'left4dead2' / 'addons'
+    
+    def _workshop_path_of(self, directory: str) -> Path:
+        """left4dead2\\addons\\workshop under directory (the memoized path for the current directory)"""
+        if directory == self._directory_path and self._workshop_path is not None:
+            return self._workshop_path
+        return self._addons_path_of(directory) / 'workshop'
     
     async def select_file(self, file: VpkFile):
         """Select a VPK file"""
@@ -183,7 +488,8 @@ class VpkManagerViewModel(BaseViewModel):
         
         self._set_loading(True)
         try:
-            success = self._extract_vpk(
+            success = await asyncio.to_thread(
+                self._extract_vpk,
                 self._selected_file.path,
                 output_dir
             )
@@ -199,115 +505,374 @@ class VpkManagerViewModel(BaseViewModel):
             self._set_loading(False)
     
     # Private helper methods
+    def _scan_directory(self, directory: str) -> Tuple[List[VpkFile], List[VpkFile]]:
+        """Scan the local addons and the workshop directories concurrently (independent I/O-bound work)"""
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            workshop_future = pool.submit(self._get_workshop_files, directory)
+            vpk_files = self._get_vpk_files(directory)
+            return vpk_files, workshop_future.result()
+    
     def _get_vpk_files(self, directory: str) -> List[VpkFile]:
         """Get list of local VPK files from left4dead2\\addons directory"""
         vpk_files = []
         
         # Construct path to addons directory: directory\\left4dead2\\addons
-        addons_path = Path(directory) / 'left4dead2' / 'addons'
+        addons_path = self._addons_path_of(directory)
         
-        _safe_print(f"_get_vpk_files: checking addons path: {addons_path}")
+        logger.debug("_get_vpk_files: checking addons path: %s", addons_path)
         
-        if not addons_path.exists():
-            _safe_print(f"_get_vpk_files: addons directory does not exist: {addons_path}")
+        try:
+            dir_mtime_ns = addons_path.stat().st_mtime_ns
+        except OSError:
+            logger.warning("_get_vpk_files: addons directory does not exist: %s", addons_path)
             return vpk_files
         
-        # Create hidden config directory at the same level as addons directory
+        cached = self._cached_listing(addons_path, dir_mtime_ns)
+        if cached is not None:
+            logger.debug("_get_vpk_files: %s unchanged since the last scan", addons_path)
+            return cached
+        
+        # Hidden config directory at the same level as addons directory
         config_dir = addons_path.parent / '.vpk_config'
-        try:
-            config_dir.mkdir(parents=True, exist_ok=True)
-            _safe_print(f"_get_vpk_files: created config directory: {config_dir}")
-        except Exception as e:
-            _safe_print(f"_get_vpk_files: failed to create config directory: {e}")
         
-        # Initialize metadata service
-        self._metadata_service = VpkMetadataService(str(config_dir))
+        # Initialize metadata service (kept across rescans of the same directory); the
+        # config directory is created along with it, so only once per directory
+        self._ensure_metadata_service(config_dir)
         
-        # Iterate through all .vpk and .vpk.disabled files in addons directory (but not in workshop subdirectory)
-        for vpk_file_path in sorted(addons_path.glob('*.vpk*')):
-            # Skip workshop directory
-            if vpk_file_path.parent.name == 'workshop':
-                continue
+        # One scandir pass lists the VPKs and the thumbnails; DirEntry.stat() reuses
+        # the listing's metadata where the platform provides it (Windows)
+        entries, thumbnails = _scan_addons(addons_path, _LOCAL_VPK_NAME)
+        self._prefetch_addontitles(entries)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        
+        # Iterate through all .vpk and .vpk.disabled files in addons directory (files only, so not the workshop subdirectory)
+        for entry in entries:
+            name = entry.name
             
             # Check if file is disabled
-            is_disabled = vpk_file_path.name.endswith('.disabled')
+            is_disabled = name.endswith('.disabled')
             
-            # Get the actual VPK path (without .disabled if present)
-            if is_disabled:
-                actual_vpk_path = vpk_file_path.with_suffix('')  # Remove .disabled
-            else:
-                actual_vpk_path = vpk_file_path
+            # Get the actual VPK name (without .disabled if present)
+            actual_vpk_name = name[:-len('.disabled')] if is_disabled else name
             
-            stat = vpk_file_path.stat()
+            stat = entry.stat()
             
             # Look for corresponding .jpg thumbnail
-            jpg_path = actual_vpk_path.with_suffix('.jpg')
-            thumbnail_path = str(jpg_path) if jpg_path.exists() else None
+            jpg_name = thumbnails.get(os.path.splitext(actual_vpk_name)[0].lower() + '.jpg')
+            thumbnail_path = str(addons_path / jpg_name) if jpg_name else None
             
-            # Extract or get cached addontitle
-            addontitle = None
-            if self._metadata_service:
-                addontitle = self._metadata_service.get_addontitle(str(vpk_file_path))
+            # Cached addontitle; unknown ones are read in the background after the scan
+            addontitle = self._known_addontitle(entry.path, stat)
             
             vpk_file = VpkFile(
-                name=vpk_file_path.name,
-                path=str(vpk_file_path),
+                name=name,
+                path=entry.path,
                 size=stat.st_size,
-                modified_time=str(stat.st_mtime),
+                modified_time=stat.st_mtime,
                 thumbnail_path=thumbnail_path or '',
                 is_disabled=is_disabled,
                 addontitle=addontitle,
             )
             vpk_files.append(vpk_file)
-            _safe_print(f"_get_vpk_files: found {vpk_file_path.name}, thumbnail={thumbnail_path}, disabled={is_disabled}, addontitle={addontitle}")
+            if debug:
+                logger.debug("_get_vpk_files: found %s, thumbnail=%s, disabled=%s, addontitle=%s", name, thumbnail_path, is_disabled, addontitle)
         
-        _safe_print(f"_get_vpk_files: found {len(vpk_files)} local VPK files")
-        return vpk_files
+        logger.debug("_get_vpk_files: found %s local VPK files", len(vpk_files))
+        with self._files_lock:
+            self._listing_cache[str(addons_path)] = (dir_mtime_ns, vpk_files)
+        return list(vpk_files)
     
     def _get_workshop_files(self, directory: str) -> List[VpkFile]:
         """Get list of Workshop VPK files from left4dead2\\addons\\workshop directory"""
         workshop_files = []
         
         # Construct path to workshop directory: directory\\left4dead2\\addons\\workshop
-        workshop_path = Path(directory) / 'left4dead2' / 'addons' / 'workshop'
+        workshop_path = self._workshop_path_of(directory)
         
-        _safe_print(f"_get_workshop_files: checking workshop path: {workshop_path}")
+        logger.debug("_get_workshop_files: checking workshop path: %s", workshop_path)
         
-        if not workshop_path.exists():
-            _safe_print(f"_get_workshop_files: workshop directory does not exist: {workshop_path}")
+        try:
+            dir_mtime_ns = workshop_path.stat().st_mtime_ns
+        except OSError:
+            logger.warning("_get_workshop_files: workshop directory does not exist: %s", workshop_path)
             return workshop_files
         
-        # Ensure metadata service is initialized
-        if not self._metadata_service:
-            config_dir = workshop_path.parent.parent / '.vpk_config'
-            self._metadata_service = VpkMetadataService(str(config_dir))
+        cached = self._cached_listing(workshop_path, dir_mtime_ns)
+        if cached is not None:
+            logger.debug("_get_workshop_files: %s unchanged since the last scan", workshop_path)
+            return cached
+        
+        # Ensure metadata service is initialized (same config directory as the local scan)
+        self._ensure_metadata_service(workshop_path.parent.parent / '.vpk_config')
+        
+        # One scandir pass lists the VPKs and the thumbnails
+        entries, thumbnails = _scan_addons(workshop_path, _WORKSHOP_VPK_NAME)
+        self._prefetch_addontitles(entries)
+        debug = logger.isEnabledFor(logging.DEBUG)
         
         # Iterate through all .vpk files in workshop directory
-        for vpk_file_path in sorted(workshop_path.glob('*.vpk')):
-            stat = vpk_file_path.stat()
+        for entry in entries:
+            name = entry.name
+            stat = entry.stat()
             
             # Look for corresponding .jpg thumbnail
-            jpg_path = vpk_file_path.with_suffix('.jpg')
-            thumbnail_path = str(jpg_path) if jpg_path.exists() else None
+            jpg_name = thumbnails.get(os.path.splitext(name)[0].lower() + '.jpg')
+            thumbnail_path = str(workshop_path / jpg_name) if jpg_name else None
             
-            # Extract or get cached addontitle
-            addontitle = None
-            if self._metadata_service:
-                addontitle = self._metadata_service.get_addontitle(str(vpk_file_path))
+            # Cached addontitle; unknown ones are read in the background after the scan
+            addontitle = self._known_addontitle(entry.path, stat)
             
             vpk_file = VpkFile(
-                name=vpk_file_path.name,
-                path=str(vpk_file_path),
+                name=name,
+                path=entry.path,
                 size=stat.st_size,
-                modified_time=str(stat.st_mtime),
+                modified_time=stat.st_mtime,
                 thumbnail_path=thumbnail_path or '',
                 addontitle=addontitle,
             )
             workshop_files.append(vpk_file)
-            _safe_print(f"_get_workshop_files: found {vpk_file_path.name}, thumbnail={thumbnail_path}, addontitle={addontitle}")
+            if debug:
+                logger.debug("_get_workshop_files: found %s, thumbnail=%s, addontitle=%s", name, thumbnail_path, addontitle)
+        
+        logger.debug("_get_workshop_files: found %s workshop files", len(workshop_files))
+        with self._files_lock:
+            self._listing_cache[str(workshop_path)] = (dir_mtime_ns, workshop_files)
+        return list(workshop_files)
+    
+    def _reload_local(self):
+        """Rescan only the local addons directory (the workshop list is kept)"""
+        addons_path = self._addons_path
+        # Overwriting an existing file in place does not move the directory mtime
+        with self._files_lock:
+            self._listing_cache.pop(str(addons_path), None)
+        vpk_files = self._get_vpk_files(self._directory_path)
+        with self._files_lock:
+            self._vpk_files = vpk_files
+        self._start_title_enrichment()
+    
+    def _merge_extracted_local(self, names: List[str]):
+        """Stat only the extracted top-level VPKs/thumbnails and merge them into the local list"""
+        addons_path = self._addons_path
+        # Before taking the files lock: swapping the service waits for the title thread
+        self._ensure_metadata_service(addons_path.parent / '.vpk_config')
+        with self._files_lock:
+            self._listing_cache.pop(str(addons_path), None)
+        
+        # Top-level members only; anything in a subdirectory is not a local VPK
+        vpk_names = set()
+        thumbnails = {}
+        for name in names:
+            # Dotfiles are skipped like in _scan_addons
+            if not name or '/' in name or name.startswith('.'):
+                continue
+            if name.lower().endswith('.jpg'):
+                thumbnails[name.lower()] = name
+            elif _LOCAL_VPK_NAME(name):
+                vpk_names.add(name)
+        if not vpk_names and not thumbnails:
+            return
         
-        _safe_print(f"_get_workshop_files: found {len(workshop_files)} workshop files")
-        return workshop_files
+        with self._files_lock:
+            self._vpk_files = self._merged_local_files(addons_path, vpk_names, thumbnails)
+        # Titles of the extracted VPKs are read by the title thread, not under the files lock
+        self._start_title_enrichment()
+        logger.debug("_merge_extracted_local: merged %s extracted VPK file(s)", len(vpk_names))
+    
+    def _merged_local_files(self, addons_path: Path, vpk_names: set, thumbnails: Dict[str, str]) -> List[VpkFile]:
+        """The local list with the extracted VPKs/thumbnails merged in (called under the files lock)"""
+        # Keyed by normcase so an archive name differing only in case updates the existing entry on Windows
+        existing = {os.path.normcase(vpk.path): vpk for vpk in self._vpk_files}
+        for vpk in self._vpk_files:
+            if vpk.thumbnail_path:
+                jpg_name = os.path.basename(vpk.thumbnail_path)
+                thumbnails.setdefault(jpg_name.lower(), jpg_name)
+        
+        for vpk in self._vpk_files:
+            if vpk.name not in vpk_names:
+                # A thumbnail extracted next to an existing VPK
+                jpg_name = thumbnails.get(os.path.splitext(vpk.name.removesuffix('.disabled'))[0].lower() + '.jpg')
+                if jpg_name and not vpk.thumbnail_path:
+                    existing[os.path.normcase(vpk.path)] = replace(vpk, thumbnail_path=str(addons_path / jpg_name))
+        
+        for name in vpk_names:
+            path = str(addons_path / name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            old = existing.get(os.path.normcase(path))
+            if old is not None:
+                # Keep the on-disk spelling of an overwritten file
+                name, path = old.name, old.path
+            is_disabled = name.endswith('.disabled')
+            stem = os.path.splitext(name.removesuffix('.disabled'))[0]
+            jpg_name = thumbnails.get(stem.lower() + '.jpg')
+            if jpg_name is None and os.path.isfile(addons_path / (stem + '.jpg')):
+                jpg_name = stem + '.jpg'
+            existing[os.path.normcase(path)] = VpkFile(
+                name=name,
+                path=path,
+                size=stat.st_size,
+                modified_time=stat.st_mtime,
+                thumbnail_path=str(addons_path / jpg_name) if jpg_name else '',
+                is_disabled=is_disabled,
+                addontitle=self._known_addontitle(path, stat),
+            )
+        
+        return sorted(existing.values(), key=attrgetter('name'))
+    
+    def _reload_workshop(self):
+        """Rescan only the workshop directory (the local list is kept)"""
+        workshop_path = self._workshop_path
+        with self._files_lock:
+            self._listing_cache.pop(str(workshop_path), None)
+        workshop_files = self._get_workshop_files(self._directory_path)
+        with self._files_lock:
+            self._workshop_files = workshop_files
+        self._start_title_enrichment()
+    
+    def _cached_listing(self, directory: Path, dir_mtime_ns: int) -> Optional[List[VpkFile]]:
+        """Files of the last scan of directory if its mtime has not moved since, else None"""
+        cached = self._listing_cache.get(str(directory))
+        if cached is None or cached[0] != dir_mtime_ns:
+            return None
+        return list(cached[1])
+    
+    def _ensure_metadata_service(self, config_dir: Path):
+        """Create the metadata service for config_dir unless the current one already uses it"""
+        with self._metadata_lock:
+            if self._metadata_service is None or self._metadata_service.config_dir != config_dir:
+                self._set_metadata_service(VpkMetadataService(str(config_dir)))
+    
+    def _set_metadata_service(self, service: Optional[VpkMetadataService]):
+        """Swap the metadata service, closing the database of the previous one"""
+        if self._metadata_service is not None:
+            # The title thread must not read through a closed database
+            self._stop_title_enrichment()
+            self._metadata_service.close()
+        self._metadata_service = service
+    
+    def _prefetch_addontitles(self, entries: List[os.DirEntry]):
+        """Fill the memo with the cached addontitles of the scanned VPKs in one query (no VPK is opened)"""
+        if not self._metadata_service:
+            return
+        missing = []
+        # The service compares the database stamps against these instead of stat'ing again
+        stamps = {}
+        for entry in entries:
+            stat = entry.stat()  # Cached on the DirEntry, so the scan loop does not stat again
+            key = (entry.path, stat.st_size, stat.st_mtime_ns)
+            if key not in self._addontitle_cache:
+                missing.append(key)
+                stamps[entry.path] = (stat.st_mtime, stat.st_size)
+        if not missing:
+            return
+        
+        titles = self._metadata_service.get_cached_addontitles([key[0] for key in missing], stamps)
+        for key in missing:
+            if key[0] in titles:
+                self._addontitle_cache[key] = titles[key[0]]
+        logger.debug("_prefetch_addontitles: %s of %s addontitles cached", len(titles), len(missing))
+    
+    def _known_addontitle(self, path: str, stat: os.stat_result) -> Optional[str]:
+        """addontitle from the memo; unknown ones are queued for the background enrichment and read as None"""
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        try:
+            return self._addontitle_cache[key]
+        except KeyError:
+            pass
+        if self._metadata_service:
+            with self._titles_lock:
+                self._pending_titles.append(key)
+        return None
+    
+    def _start_title_enrichment(self):
+        """Read the queued addontitles on a background thread unless one is already doing so"""
+        with self._titles_lock:
+            if not self._pending_titles or self._title_thread is not None or self._title_stop.is_set():
+                return
+            self._title_thread = threading.Thread(target=self._enrich_addontitles, daemon=True)
+            self._title_thread.start()
+    
+    def _stop_title_enrichment(self):
+        """Stop the title thread after its batch in flight and drop the queued addontitles"""
+        with self._titles_lock:
+            self._title_stop.set()
+            thread = self._title_thread
+        if thread is not None:
+            thread.join()
+        with self._titles_lock:
+            dropped = bool(self._pending_titles) or thread is not None
+            self._pending_titles.clear()
+            self._title_stop.clear()
+        if dropped:
+            # Cached listings skip the title queue; rescans must queue the dropped titles again
+            with self._files_lock:
+                self._listing_cache.clear()
+    
+    def _enrich_addontitles(self):
+        """Background thread: read queued addontitles in batches and patch them into the file lists"""
+        try:
+            while True:
+                with self._titles_lock:
+                    batch = list(dict.fromkeys(self._pending_titles[:_TITLE_BATCH]))
+                    del self._pending_titles[:_TITLE_BATCH]
+                    more = bool(self._pending_titles)
+                service = self._metadata_service
+                if service is None or self._title_stop.is_set():
+                    # Disposed, or the service is being swapped
+                    return
+                # Titles read meanwhile (e.g. queued again by a rescan) still need applying
+                known = {key: self._addontitle_cache[key] for key in batch if key in self._addontitle_cache}
+                unknown = [key for key in batch if key not in known]
+                if unknown:
+                    titles = service.get_addontitles_bulk([key[0] for key in unknown])
+                    self._addontitle_cache.update(zip(unknown, titles))
+                    known.update(zip(unknown, titles))
+                self._apply_addontitles({key[0]: title for key, title in known.items() if title})
+                if not more:
+                    break
+            self._save_listing_snapshot()
+        except Exception:
+            logger.exception("_enrich_addontitles: failed to read addontitles")
+        finally:
+            with self._titles_lock:
+                self._title_thread = None
+                if self._metadata_service is None:
+                    self._pending_titles.clear()
+            # Titles queued after the last batch was taken
+            self._start_title_enrichment()
+    
+    def _apply_addontitles(self, titles: Dict[str, str]):
+        """Swap in copies of the listed files that gained an addontitle and notify"""
+        if not titles:
+            return
+        
+        def patched(files: List[VpkFile]) -> Optional[List[VpkFile]]:
+            if not any(vpk.addontitle is None and vpk.path in titles for vpk in files):
+                return None
+            return [
+                replace(vpk, addontitle=titles[vpk.path])
+                if vpk.addontitle is None and vpk.path in titles else vpk
+                for vpk in files
+            ]
+        
+        # New list objects tell listeners the files changed; the lists are re-read under the
+        # lock so a list published meanwhile (e.g. by a disable) is patched, not overwritten
+        with self._files_lock:
+            vpk_files = patched(self._vpk_files)
+            if vpk_files is not None:
+                self._vpk_files = vpk_files
+            workshop_files = patched(self._workshop_files)
+            if workshop_files is not None:
+                self._workshop_files = workshop_files
+            # Later cache hits of an unchanged directory list the titles too
+            for directory, (dir_mtime_ns, files) in list(self._listing_cache.items()):
+                files = patched(files)
+                if files is not None:
+                    self._listing_cache[directory] = (dir_mtime_ns, files)
+        if vpk_files is not None or workshop_files is not None:
+            self.notify_listeners()
     
     def _extract_vpk(self, file_path: str, output_dir: str) -> bool:
         """Extract VPK file"""
@@ -315,7 +880,7 @@ class VpkManagerViewModel(BaseViewModel):
             # Placeholder for VPK extraction logic
             return True
         except Exception as e:
-            _safe_print(f"Error extracting VPK: {e}")
+            logger.error("Error extracting VPK: %s", e)
             return False
     
     def _set_loading(self, loading: bool):
@@ -332,189 +897,268 @@ class VpkManagerViewModel(BaseViewModel):
         
         self._set_loading(True)
         try:
-            archive_path_obj = Path(archive_path)
-            if not archive_path_obj.exists():
+            # Determine archive type from its content (a misleading extension does not matter)
+            try:
+                kind = _archive_kind(archive_path)
+            except FileNotFoundError:
                 self._error_message = f'Archive file not found: {archive_path}'
                 return False
-            
-            # Determine archive type and extract
-            if archive_path.lower().endswith('.zip'):
-                success = self._extract_zip(archive_path)
-            elif archive_path.lower().endswith('.7z'):
-                success = self._extract_7z(archive_path)
-            elif archive_path.lower().endswith('.tar.zst') or archive_path.lower().endswith('.tar.zstd'):
-                success = self._extract_tar_zst(archive_path)
-            elif archive_path.lower().endswith('.tar'):
-                success = self._extract_tar(archive_path)
-            else:
+            extractor = {
+                'zip': self._extract_zip,
+                '7z': self._extract_7z,
+                'tar.zst': self._extract_tar_zst,
+                'tar': self._extract_tar,
+            }.get(kind)
+            if extractor is None:
                 self._error_message = 'Unsupported archive format. Supported formats: ZIP, 7Z, TAR.ZST, TAR'
                 return False
             
+            # Ensure addons directory exists (once here rather than in every extractor)
+            self._addons_path.mkdir(parents=True, exist_ok=True)
+            
+            # Extractors return the written paths relative to addons, '/'-separated (None on failure)
+            names = extractor(archive_path)
+            success = names is not None
             if success:
-                # Reload VPK files after extraction
-                _safe_print(f"extract_archive_sync: reloading VPK files after extraction")
-                self._vpk_files = self._get_vpk_files(self._directory_path)
-                self._workshop_files = self._get_workshop_files(self._directory_path)
+                # Merge the extracted VPKs into the local list; rescan the workshop only if the archive wrote into it
+                logger.debug("extract_archive_sync: reloading VPK files after extraction")
+                self._merge_extracted_local(names)
+                if _touches_workshop(names):
+                    self._reload_workshop()
                 self._error_message = ''
-                _safe_print(f"extract_archive_sync: extraction and reload completed successfully")
-                _safe_print(f"extract_archive_sync: {len(self._vpk_files)} local VPK files, {len(self._workshop_files)} workshop files")
+                logger.debug("extract_archive_sync: extraction and reload completed successfully")
+                logger.debug("extract_archive_sync: %s local VPK files, %s workshop files", len(self._vpk_files), len(self._workshop_files))
             
             return success
         except Exception as e:
             self._error_message = f'Error extracting archive: {str(e)}'
-            _safe_print(f"extract_archive_sync: {self._error_message}")
+            logger.error("extract_archive_sync: %s", self._error_message)
             return False
         finally:
-            self._set_loading(False)
-            _safe_print(f"extract_archive_sync: calling notify_listeners()")
-            self.notify_listeners()
+            # One notification for the loading flag and the reloaded lists
+            with self.batch():
+                self._set_loading(False)
+                logger.debug("extract_archive_sync: calling notify_listeners()")
+                self.notify_listeners()
     
-    def _extract_zip(self, zip_path: str) -> bool:
+    def _extract_zip(self, zip_path: str) -> Optional[List[str]]:
         """Extract ZIP archive to local addons directory (overwrite existing files)"""
         try:
-            addons_path = Path(self._directory_path) / 'left4dead2' / 'addons'
-            
-            # Ensure addons directory exists
-            addons_path.mkdir(parents=True, exist_ok=True)
+            addons_path = self._addons_path
             
-            _safe_print(f"_extract_zip: extracting {zip_path} to {addons_path}")
+            logger.debug("_extract_zip: extracting %s to %s", zip_path, addons_path)
             
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # extractall() will overwrite existing files by default
-                zip_ref.extractall(addons_path)
-                
-                # Log extracted files
-                extracted_files = zip_ref.namelist()
-                _safe_print(f"_extract_zip: extracted {len(extracted_files)} file(s)")
-                for file in extracted_files[:10]:  # Log first 10 files
-                    print(f"  - {file}")
-                if len(extracted_files) > 10:
-                    _safe_print(f"  ... and {len(extracted_files) - 10} more file(s)")
-            
-            _safe_print(f"_extract_zip: successfully completed")
-            return True
+                infos = zip_ref.infolist()
+            
+            # Inflating releases the GIL, so members are extracted on several threads;
+            # ZipFile reads are not thread-safe, so each worker opens its own handle.
+            # Largest members are dealt out first to balance the workers.
+            workers = min(_EXTRACT_WORKERS, len(infos))
+            if workers > 1:
+                by_size = sorted(infos, key=lambda info: info.file_size, reverse=True)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    for future in [
+                        pool.submit(self._extract_zip_members, zip_path, by_size[i::workers], addons_path)
+                        for i in range(workers)
+                    ]:
+                        future.result()
+            else:
+                self._extract_zip_members(zip_path, infos, addons_path)
+            
+            # Log extracted files
+            logger.debug("_extract_zip: extracted %s file(s)", len(infos))
+            for info in infos[:10]:  # Log first 10 files
+                logger.debug("  - %s", info.filename)
+            if len(infos) > 10:
+                logger.debug("  ... and %s more file(s)", len(infos) - 10)
+            
+            logger.debug("_extract_zip: successfully completed")
+            return [_zip_member_path(info.filename) for info in infos]
         except Exception as e:
             self._error_message = f'Error extracting ZIP: {str(e)}'
-            _safe_print(f"_extract_zip: {self._error_message}")
+            logger.error("_extract_zip: %s", self._error_message)
+            return None
+    
+    @staticmethod
+    def _extract_zip_members(zip_path: str, infos: List[zipfile.ZipInfo], addons_path: Path):
+        """Extract the given members through a ZipFile handle of this thread (overwrites existing files)"""
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref, open(zip_path, 'rb', buffering=0) as raw:
+            for info in infos:
+                if _HAS_SENDFILE and VpkManagerViewModel._sendfile_zip_member(raw.fileno(), info, addons_path):
+                    continue
+                try:
+                    zip_ref.extract(info, addons_path)
+                except FileExistsError:
+                    # Another worker created the same parent directory in between; it exists now
+                    zip_ref.extract(info, addons_path)
+    
+    @staticmethod
+    def _sendfile_zip_member(src_fd: int, info: zipfile.ZipInfo, addons_path: Path) -> bool:
+        """Copy a large STORED member with os.sendfile; False leaves the member to ZipFile.extract"""
+        if (info.compress_type != zipfile.ZIP_STORED or info.file_size < _SENDFILE_MIN_SIZE
+                or info.flag_bits & 0x1 or info.is_dir()):
+            return False
+        
+        # Same target path rules as ZipFile.extract (POSIX only, so no Windows name sanitizing)
+        relative = _zip_member_path(info.filename)
+        if not relative:
+            return False
+        target = os.path.join(addons_path, relative)
+        
+        # Member data follows its local header (30 bytes + name + extra field)
+        header = os.pread(src_fd, 30, info.header_offset)
+        if len(header) != 30 or header[:4] != b'PK\x03\x04':
             return False
+        name_len, extra_len = struct.unpack('<HH', header[26:30])
+        offset = info.header_offset + 30 + name_len + extra_len
+        
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            with open(target, 'wb') as f_out:
+                remaining = info.file_size
+                while remaining:
+                    sent = os.sendfile(f_out.fileno(), src_fd, offset, remaining)
+                    if not sent:
+                        raise OSError(f'unexpected end of archive data for {info.filename}')
+                    offset += sent
+                    remaining -= sent
+        except OSError as e:
+            # e.g. a platform whose sendfile only writes to sockets
+            logger.debug("_sendfile_zip_member: %s (%s); using ZipFile.extract", info.filename, e)
+            return False
+        
+        # ZipFile.extract verifies the CRC while copying; check the copy the same way
+        crc = 0
+        with open(target, 'rb', buffering=0) as f_in:
+            while chunk := f_in.read(_COPY_BUFSIZE):
+                crc = zlib.crc32(chunk, crc)
+        if crc != info.CRC:
+            raise zipfile.BadZipFile(f'Bad CRC-32 for file {info.filename!r}')
+        return True
     
-    def _extract_7z(self, seven_z_path: str) -> bool:
+    def _extract_7z(self, seven_z_path: str) -> Optional[List[str]]:
         """Extract 7Z archive to local addons directory (overwrite existing files)"""
         if not HAS_7ZR:
             self._error_message = 'py7zr library not installed. Install with: pip install py7zr'
-            _safe_print(f"_extract_7z: {self._error_message}")
-            return False
+            logger.error("_extract_7z: %s", self._error_message)
+            return None
         
         try:
-            addons_path = Path(self._directory_path) / 'left4dead2' / 'addons'
-            
-            # Ensure addons directory exists
-            addons_path.mkdir(parents=True, exist_ok=True)
+            addons_path = self._addons_path
             
-            _safe_print(f"_extract_7z: extracting {seven_z_path} to {addons_path}")
+            logger.debug("_extract_7z: extracting %s to %s", seven_z_path, addons_path)
             
             with py7zr.SevenZipFile(seven_z_path, 'r') as archive:
+                # Names come from the header parsed on open; read them once, up front
+                all_names = archive.getnames()
+                
                 # extractall() will overwrite existing files by default
                 archive.extractall(path=addons_path)
                 
                 # Log archive info
-                all_names = archive.getnames()
-                _safe_print(f"_extract_7z: extracted {len(all_names)} file(s)")
+                logger.debug("_extract_7z: extracted %s file(s)", len(all_names))
                 for file in all_names[:10]:  # Log first 10 files
-                    _safe_print(f"  - {file}")
+                    logger.debug("  - %s", file)
                 if len(all_names) > 10:
-                    _safe_print(f"  ... and {len(all_names) - 10} more file(s)")
+                    logger.debug("  ... and %s more file(s)", len(all_names) - 10)
             
-            _safe_print(f"_extract_7z: successfully completed")
-            return True
+            logger.debug("_extract_7z: successfully completed")
+            return [_member_path(name) for name in all_names]
         except Exception as e:
             self._error_message = f'Error extracting 7Z: {str(e)}'
-            _safe_print(f"_extract_7z: {self._error_message}")
-            return False
+            logger.error("_extract_7z: %s", self._error_message)
+            return None
     
-    def _extract_tar_zst(self, tar_zst_path: str) -> bool:
+    def _extract_tar_zst(self, tar_zst_path: str) -> Optional[List[str]]:
         """Extract TAR.ZST archive to local addons directory (overwrite existing files)"""
         if not HAS_ZSTD:
             self._error_message = 'zstandard library not installed. Install with: pip install zstandard'
-            _safe_print(f"_extract_tar_zst: {self._error_message}")
-            return False
+            logger.error("_extract_tar_zst: %s", self._error_message)
+            return None
         
         try:
-            addons_path = Path(self._directory_path) / 'left4dead2' / 'addons'
-            
-            # Ensure addons directory exists
-            addons_path.mkdir(parents=True, exist_ok=True)
+            addons_path = self._addons_path
             
-            print(f"_extract_tar_zst: extracting {tar_zst_path} to {addons_path}")
+            logger.debug("_extract_tar_zst: extracting %s to %s", tar_zst_path, addons_path)
             
             # Decompress zstd and extract tar
-            dctx = zstd.ZstdDecompressor()
-            with open(tar_zst_path, 'rb') as f_in:
-                with dctx.stream_reader(f_in) as reader:
-                    with tarfile.open(fileobj=reader, mode='r|') as tar:
+            dctx = zstd.ZstdDecompressor(max_window_size=_ZSTD_MAX_WINDOW_SIZE)
+            with open(tar_zst_path, 'rb', buffering=_COPY_BUFSIZE) as f_in:
+                # Archives made of concatenated frames (e.g. by pzstd) are read to the end
+                with dctx.stream_reader(
+                    f_in,
+                    read_size=zstd.DECOMPRESSION_RECOMMENDED_INPUT_SIZE,
+                    read_across_frames=True,
+                ) as reader:
+                    with tarfile.open(fileobj=reader, mode='r|', bufsize=_COPY_BUFSIZE,
+                                      copybufsize=_COPY_BUFSIZE) as tar:
                         # Extract all files
                         tar.extractall(path=addons_path)
                         
-                        # Log tar info
-                        print(f"_extract_tar_zst: extracted files from archive")
+                        # Members read while streaming are kept, so this does not re-read
+                        names = tar.getnames()
+                        logger.debug("_extract_tar_zst: extracted %s file(s)", len(names))
             
-            print(f"_extract_tar_zst: successfully completed")
-            return True
+            logger.debug("_extract_tar_zst: successfully completed")
+            return [_member_path(name) for name in names]
         except Exception as e:
             self._error_message = f'Error extracting TAR.ZST: {str(e)}'
-            print(f"_extract_tar_zst: {self._error_message}")
-            return False
+            logger.error("_extract_tar_zst: %s", self._error_message)
+            return None
     
-    def _extract_tar(self, tar_path: str) -> bool:
+    def _extract_tar(self, tar_path: str) -> Optional[List[str]]:
         """Extract TAR archive to local addons directory (overwrite existing files)"""
         try:
-            addons_path = Path(self._directory_path) / 'left4dead2' / 'addons'
-            
-            # Ensure addons directory exists
-            addons_path.mkdir(parents=True, exist_ok=True)
+            addons_path = self._addons_path
             
-            print(f"_extract_tar: extracting {tar_path} to {addons_path}")
+            logger.debug("_extract_tar: extracting %s to %s", tar_path, addons_path)
             
             # Extract tar archive
-            with tarfile.open(tar_path, 'r') as tar:
+            with tarfile.open(tar_path, 'r', copybufsize=_COPY_BUFSIZE) as tar:
                 # Extract all files
                 tar.extractall(path=addons_path)
                 
                 # Log tar info
                 members = tar.getmembers()
-                print(f"_extract_tar: extracted {len(members)} file(s)")
+                logger.debug("_extract_tar: extracted %s file(s)", len(members))
                 for member in members[:10]:  # Log first 10 files
-                    print(f"  - {member.name}")
+                    logger.debug("  - %s", member.name)
                 if len(members) > 10:
-                    print(f"  ... and {len(members) - 10} more file(s)")
+                    logger.debug("  ... and %s more file(s)", len(members) - 10)
             
-            print(f"_extract_tar: successfully completed")
-            return True
+            logger.debug("_extract_tar: successfully completed")
+            return [_member_path(member.name) for member in members]
         except Exception as e:
             self._error_message = f'Error extracting TAR: {str(e)}'
-            print(f"_extract_tar: {self._error_message}")
-            return False
+            logger.error("_extract_tar: %s", self._error_message)
+            return None
     
     def disable_vpk_sync(self, vpk_file: VpkFile) -> bool:
         """Disable a VPK file by renaming it to .vpk.disabled"""
         try:
             if vpk_file.is_disabled:
-                print(f"disable_vpk_sync: VPK is already disabled: {vpk_file.path}")
+                logger.debug("disable_vpk_sync: VPK is already disabled: %s", vpk_file.path)
                 return False
             
-            vpk_path = Path(vpk_file.path)
-            disabled_path = vpk_path.with_suffix(vpk_path.suffix + '.disabled')
+            disabled_path = vpk_file.path + '.disabled'
             
-            print(f"disable_vpk_sync: renaming {vpk_path} to {disabled_path}")
-            vpk_path.rename(disabled_path)
+            logger.debug("disable_vpk_sync: renaming %s to %s", vpk_file.path, disabled_path)
+            # os.replace overwrites a stale .vpk.disabled on every platform (Path.rename fails on Windows)
+            os.replace(vpk_file.path, disabled_path)
             
-            # Reload VPK files to reflect changes
-            self.load_vpk_files_sync(self._directory_path)
-            print(f"disable_vpk_sync: VPK disabled successfully")
+            # Patch the one entry instead of rescanning the directory
+            self._replace_local_file(vpk_file, replace(
+                vpk_file,
+                name=vpk_file.name + '.disabled',
+                path=disabled_path,
+                is_disabled=True,
+            ))
+            logger.debug("disable_vpk_sync: VPK disabled successfully")
             return True
         except Exception as e:
             self._error_message = f'Error disabling VPK: {str(e)}'
-            print(f"disable_vpk_sync: {self._error_message}")
+            logger.error("disable_vpk_sync: %s", self._error_message)
             self.notify_listeners()
             return False
     
@@ -522,104 +1166,130 @@ class VpkManagerViewModel(BaseViewModel):
         """Enable a VPK file by renaming it from .vpk.disabled to .vpk"""
         try:
             if not vpk_file.is_disabled:
-                print(f"enable_vpk_sync: VPK is not disabled: {vpk_file.path}")
+                logger.warning("enable_vpk_sync: VPK is not disabled: %s", vpk_file.path)
                 return False
             
-            vpk_path = Path(vpk_file.path)
             # Remove .disabled suffix
-            enabled_path = vpk_path.with_suffix('')
+            enabled_path = vpk_file.path[:-len('.disabled')]
             
-            print(f"enable_vpk_sync: renaming {vpk_path} to {enabled_path}")
-            vpk_path.rename(enabled_path)
+            logger.debug("enable_vpk_sync: renaming %s to %s", vpk_file.path, enabled_path)
+            os.replace(vpk_file.path, enabled_path)
             
-            # Reload VPK files to reflect changes
-            self.load_vpk_files_sync(self._directory_path)
-            print(f"enable_vpk_sync: VPK enabled successfully")
+            # Patch the one entry instead of rescanning the directory
+            self._replace_local_file(vpk_file, replace(
+                vpk_file,
+                name=vpk_file.name[:-len('.disabled')],
+                path=enabled_path,
+                is_disabled=False,
+            ))
+            logger.debug("enable_vpk_sync: VPK enabled successfully")
             return True
         except Exception as e:
             self._error_message = f'Error enabling VPK: {str(e)}'
-            print(f"enable_vpk_sync: {self._error_message}")
+            logger.error("enable_vpk_sync: %s", self._error_message)
             self.notify_listeners()
             return False
     
     def delete_vpk_sync(self, vpk_file: VpkFile) -> bool:
         """Delete a VPK file and its thumbnail"""
+        from features.vpk_manager.services.vpk_export_service import VpkExportService
+        
         try:
-            vpk_path = Path(vpk_file.path)
-            
-            # Delete VPK file
-            if vpk_path.exists():
-                print(f"delete_vpk_sync: deleting {vpk_path}")
-                vpk_path.unlink()
-            
-            # Delete thumbnail if it exists
-            if vpk_file.thumbnail_path:
-                thumbnail_path = Path(vpk_file.thumbnail_path)
-                if thumbnail_path.exists():
-                    print(f"delete_vpk_sync: deleting thumbnail {thumbnail_path}")
-                    thumbnail_path.unlink()
-            
-            # Reload VPK files to reflect changes
-            self.load_vpk_files_sync(self._directory_path)
-            print(f"delete_vpk_sync: VPK deleted successfully")
+            # Same deletion (recycle bin when available) as the bulk delete
+            success, message = VpkExportService.delete_vpk_files([vpk_file])
+            # The row and the error reach listeners as one notification
+            with self.batch():
+                if not os.path.exists(vpk_file.path):
+                    # Drop the one entry instead of rescanning the directory (also when only
+                    # the thumbnail failed: the VPK itself is gone)
+                    self._replace_local_file(vpk_file, None)
+                if not success:
+                    self._error_message = message
+                    logger.error("delete_vpk_sync: %s", message)
+                    self.notify_listeners()
+                    return False
+            logger.debug("delete_vpk_sync: VPK deleted successfully")
             return True
         except Exception as e:
             self._error_message = f'Error deleting VPK: {str(e)}'
-            print(f"delete_vpk_sync: {self._error_message}")
+            logger.error("delete_vpk_sync: %s", self._error_message)
             self.notify_listeners()
             return False
     
+    def _replace_local_file(self, old: VpkFile, new: Optional[VpkFile]):
+        """Swap (or with None, remove) one local entry after a single-file operation and notify"""
+        with self._files_lock:
+            # The rename/unlink may land within the directory's mtime granularity of the last scan
+            self._listing_cache.clear()
+            # A new list object tells listeners the files changed; untouched entries are shared
+            files = []
+            for vpk in self._vpk_files:
+                if vpk.path != old.path:
+                    # A file the rename replaced is gone from disk
+                    if new is None or vpk.path != new.path:
+                        files.append(vpk)
+                elif new is not None:
+                    files.append(new)
+            self._vpk_files = files
+        # Same as after a reload: selections do not survive a file operation
+        self._selected_vpk_files.clear()
+        self._selected_workshop_files.clear()
+        self.notify_listeners()
+    
     def toggle_vpk_selection(self, vpk_file: VpkFile) -> bool:
         """Toggle selection of a local VPK file. Returns True if selected, False if deselected"""
         if vpk_file.path in self._selected_vpk_files:
             self._selected_vpk_files.remove(vpk_file.path)
-            print(f"toggle_vpk_selection: deselected {vpk_file.name}")
+            logger.debug("toggle_vpk_selection: deselected %s", vpk_file.name)
             is_selected = False
         else:
             # Deselect workshop files when selecting local VPK
             self._selected_workshop_files.clear()
             self._selected_vpk_files.add(vpk_file.path)
-            print(f"toggle_vpk_selection: selected {vpk_file.name}")
+            logger.debug("toggle_vpk_selection: selected %s", vpk_file.name)
             is_selected = True
-        self.notify_listeners()
+        self.notify_listeners(self.CHANGE_SELECTION)
         return is_selected
     
     def toggle_workshop_selection(self, workshop_file: VpkFile) -> bool:
         """Toggle selection of a workshop file. Returns True if selected, False if deselected"""
         if workshop_file.path in self._selected_workshop_files:
             self._selected_workshop_files.remove(workshop_file.path)
-            print(f"toggle_workshop_selection: deselected {workshop_file.name}")
+            logger.debug("toggle_workshop_selection: deselected %s", workshop_file.name)
             is_selected = False
         else:
             # Deselect local VPK files when selecting workshop file
             self._selected_vpk_files.clear()
             self._selected_workshop_files.add(workshop_file.path)
-            print(f"toggle_workshop_selection: selected {workshop_file.name}")
+            logger.debug("toggle_workshop_selection: selected %s", workshop_file.name)
             is_selected = True
-        self.notify_listeners()
+        self.notify_listeners(self.CHANGE_SELECTION)
         return is_selected
     
     def clear_selection(self):
         """Clear all selections"""
         self._selected_vpk_files.clear()
         self._selected_workshop_files.clear()
-        self.notify_listeners()
+        self.notify_listeners(self.CHANGE_SELECTION)
     
     def get_selected_files(self) -> List[VpkFile]:
-        """Get list of selected VpkFile objects"""
-        selected_files = []
-        
-        # Get selected local VPK files
-        for vpk_file in self._vpk_files:
-            if vpk_file.path in self._selected_vpk_files:
-                selected_files.append(vpk_file)
-        
-        # Get selected workshop files
-        for workshop_file in self._workshop_files:
-            if workshop_file.path in self._selected_workshop_files:
-                selected_files.append(workshop_file)
-        
-        return selected_files
+        """Get list of selected VpkFile objects (local first, each in list order)"""
+        return (
+            self._resolve_selection('local', self._vpk_files, self._selected_vpk_files)
+            + self._resolve_selection('workshop', self._workshop_files, self._selected_workshop_files)
+        )
+    
+    def _resolve_selection(self, kind: str, files: List[VpkFile], selected: set) -> List[VpkFile]:
+        """Selected files of one list through its path index (O(selected) once the index exists)"""
+        if not selected:
+            return []
+        cached = self._path_indexes.get(kind)
+        if cached is not None and cached[0] is files:
+            index = cached[1]
+        else:
+            index = {vpk.path: (position, vpk) for position, vpk in enumerate(files)}
+            self._path_indexes[kind] = (files, index)
+        return [vpk for _, vpk in sorted(index[path] for path in selected if path in index)]
     
     def export_selected_vpk_files_sync(self, output_dir: str) -> bool:
         """Export selected VPK files to 7z archive (synchronous)"""
@@ -632,28 +1302,32 @@ class VpkManagerViewModel(BaseViewModel):
             return False
         
         self._is_exporting = True
+        self._export_started = time.monotonic()
         self.notify_listeners()
         
-        try:
-            success, message, elapsed_time = VpkExportService.export_vpk_files_to_7z(selected_files, output_dir)
-            self._export_elapsed_time = elapsed_time
-            if success:
-                self._error_message = ''
-                # Clear selection after successful export
-                self.clear_selection()
-                print(f"export_selected_vpk_files_sync: export completed successfully in {elapsed_time:.2f} seconds")
-            else:
-                self._error_message = message
-                print(f"export_selected_vpk_files_sync: export failed - {message}")
-            
-            return success
-        except Exception as e:
-            self._error_message = f'Error exporting VPK files: {str(e)}'
-            print(f"export_selected_vpk_files_sync: {self._error_message}")
-            return False
-        finally:
-            self._is_exporting = False
-            self.notify_listeners()
+        # Selection clearing and the final state reach listeners as one notification
+        with self.batch():
+            try:
+                success, message, elapsed_time = VpkExportService.export_vpk_files_to_7z(selected_files, output_dir)
+                self._export_elapsed_time = elapsed_time
+                if success:
+                    self._error_message = ''
+                    # Clear selection after successful export
+                    self.clear_selection()
+                    logger.debug("export_selected_vpk_files_sync: export completed successfully in %.2f seconds", elapsed_time)
+                else:
+                    self._error_message = message
+                    logger.error("export_selected_vpk_files_sync: export failed - %s", message)
+                
+                return success
+            except Exception as e:
+                self._error_message = f'Error exporting VPK files: {str(e)}'
+                logger.error("export_selected_vpk_files_sync: %s", self._error_message)
+                return False
+            finally:
+                self._is_exporting = False
+                self._export_started = None
+                self.notify_listeners()
     
     def delete_selected_vpk_files_sync(self) -> bool:
         """Delete selected VPK files (synchronous)"""
@@ -666,33 +1340,48 @@ class VpkManagerViewModel(BaseViewModel):
             return False
         
         self._is_exporting = True  # Reuse exporting flag to block operations
+        self._export_started = time.monotonic()
         self.notify_listeners()
         
-        try:
-            success, message = VpkExportService.delete_vpk_files(selected_files)
-            if success:
-                self._error_message = ''
-                # Reload VPK files to reflect deletions
-                self.load_vpk_files_sync(self._directory_path)
-                print(f"delete_selected_vpk_files_sync: deletion completed successfully")
-            else:
-                self._error_message = message
-                print(f"delete_selected_vpk_files_sync: deletion failed - {message}")
-            
-            return success
-        except Exception as e:
-            self._error_message = f'Error deleting VPK files: {str(e)}'
-            print(f"delete_selected_vpk_files_sync: {self._error_message}")
-            return False
-        finally:
-            self._is_exporting = False
-            self.notify_listeners()
+        # The reload and the final state reach listeners as one notification
+        with self.batch():
+            try:
+                had_local = bool(self._selected_vpk_files)
+                had_workshop = bool(self._selected_workshop_files)
+                success, message = VpkExportService.delete_vpk_files(selected_files)
+                # Reload the lists that had deletions (also after a partial failure)
+                if had_local:
+                    self._reload_local()
+                if had_workshop:
+                    self._reload_workshop()
+                self._selected_vpk_files.clear()
+                self._selected_workshop_files.clear()
+                if success:
+                    self._error_message = ''
+                    logger.debug("delete_selected_vpk_files_sync: deletion completed successfully")
+                else:
+                    self._error_message = message
+                    logger.error("delete_selected_vpk_files_sync: deletion failed - %s", message)
+                
+                return success
+            except Exception as e:
+                self._error_message = f'Error deleting VPK files: {str(e)}'
+                logger.error("delete_selected_vpk_files_sync: %s", self._error_message)
+                return False
+            finally:
+                self._is_exporting = False
+                self._export_started = None
+                self.notify_listeners()
     
     def dispose(self):
         """Clean up resources"""
         super().dispose()
+        self._set_metadata_service(None)
+        self._addons_path = None
+        self._workshop_path = None
         self._vpk_files.clear()
         self._workshop_files.clear()
+        self._path_indexes.clear()
         self._selected_file: Optional[VpkFile] = None
         self._selected_vpk_files.clear()
         self._selected_workshop_files.clear()